@@ -9,9 +9,6 @@ fi
 # Remove leading dot if provided
 EXT="${1#.}"
 
-# Find all files recursively in the current directory
-find "$PWD" -type f -name "*.$EXT" | while read -r f; do
-    echo "-------------------------- [[ FILE $(basename "$f") ]]  --------------------------"
-    cat "$f"
-    echo
-done
+# Print all *.EXT files under the current directory using the shared catall engine
+exec python3 "$(dirname "$(readlink -f "$0")")/../Copy all Content recursively/catall.py" \
+    "$PWD" ".$EXT" --stdout --no-gitignore --style banner
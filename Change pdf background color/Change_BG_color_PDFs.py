@@ -1,15 +1,444 @@
+"""
+Put a solid background color behind every page of a PDF.
+
+Usage:
+    python Change_BG_color_PDFs.py input.pdf output.pdf --color "#c8d2b4"
+    python Change_BG_color_PDFs.py books/ recolored/ --color 200,210,180 --processes 8
+
+Results are kept in a content-addressed cache keyed by (input SHA-256,
+color), so a file that was already recolored with the same color is
+copied from the cache instead of being processed again. Outputs are
+separate files (a reflink clone where the filesystem supports it, never a
+hard link), so editing an output in place cannot change the cache entry or
+other outputs, and entries are stored read-only. After each run the least
+recently used entries are pruned past --cache-max-mb (default 2 GiB);
+--clear-cache empties it.
+"""
+
+import argparse
+import hashlib
+import stat
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import fitz  # PyMuPDF
 
-# Example usage
-input_pdf_path = "/home/codsalah/Documents/DDIA1.pdf"  
-output_pdf_path = "/home/codsalah/Documents/DDIA5.pdf"
+# Name the shared background is registered under in each page's /XObject resources
+BACKGROUND_XOBJECT = "BgFill"
+
+# Pages per worker shard when one document is recolored in parallel
+SHARD_PAGES = 500
+
+DEFAULT_COLOR = (200 / 255, 210 / 255, 180 / 255)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdf_recolor")
+# Least recently used entries are pruned past this size (see prune_cache)
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+# Bump when the recolor output or the entry layout changes so old cache entries are not reused
+# (v2: entries are copies, no longer hard-linked to outputs)
+CACHE_VERSION = 2
+# Linux ioctl that makes a file share another's extents copy-on-write (btrfs, XFS)
+FICLONE = 0x40049409
+
 
-background_color = (200 / 255, 210 / 255, 180 / 255)  # Define background color once
-with fitz.open(input_pdf_path) as doc:
+def add_background_per_page(doc, background_color):
+    """Draw the background into every page's own content stream."""
     for page in doc:
         # Apply background fill in one step instead of drawing a rectangle
         page.draw_rect(page.rect, color=None, fill=background_color, overlay=False)
 
-    doc.save(output_pdf_path)
 
-print("Background color changed and saved to", output_pdf_path)
+def _set_resource(doc, page, name, xref):
+    """Register xref as /XObject /name in the page's resources. Returns False if they are inherited."""
+    kind, value = doc.xref_get_key(page.xref, "Resources")
+    if kind == "xref":
+        owner, prefix = int(value.split()[0]), ""
+    elif kind == "dict":
+        owner, prefix = page.xref, "Resources/"
+    else:
+        return False
+    kind, value = doc.xref_get_key(owner, prefix + "XObject")
+    if kind == "xref":
+        doc.xref_set_key(int(value.split()[0]), name, f"{xref} 0 R")
+    else:
+        doc.xref_set_key(owner, prefix + "XObject/" + name, f"{xref} 0 R")
+    return True
+
+
+def add_shared_background(doc, background_color):
+    """
+    Define the background once per page size as a Form XObject and put it
+    behind every page by reference: each page gets the same small content
+    stream ("q /BgFill0 Do Q") prepended to its /Contents.
+    """
+    r, g, b = background_color
+    shared = {}  # mediabox -> (resource name, Form XObject xref, content stream xref)
+    for page in doc:
+        box = tuple(page.mediabox)
+        if box not in shared:
+            x0, y0, x1, y1 = box
+            name = f"{BACKGROUND_XOBJECT}{len(shared)}"
+            form = doc.get_new_xref()
+            doc.update_object(form, f"<< /Type /XObject /Subtype /Form /BBox [{x0:g} {y0:g} {x1:g} {y1:g}] "
+                                    f"/Resources << >> >>")
+            doc.update_stream(form, f"{r:.8g} {g:.8g} {b:.8g} rg {x0:g} {y0:g} {x1 - x0:g} {y1 - y0:g} re f".encode())
+            content = doc.get_new_xref()
+            doc.update_object(content, "<< >>")
+            doc.update_stream(content, f"q /{name} Do Q".encode())
+            shared[box] = (name, form, content)
+
+        name, form, content = shared[box]
+        if not _set_resource(doc, page, name, form):
+            page.draw_rect(page.rect, color=None, fill=background_color, overlay=False)
+            continue
+        contents = " ".join(f"{xref} 0 R" for xref in page.get_contents())
+        doc.xref_set_key(page.xref, "Contents", f"[{content} 0 R {contents}]")
+
+
+def change_background_color(input_pdf_path, output_pdf_path, background_color, shared=True):
+    """
+    Put a solid background behind every page. shared=True uses one Form
+    XObject for the whole document and saves with deflated streams and
+    unused objects removed; shared=False is the old per-page drawing.
+    """
+    with fitz.open(input_pdf_path) as doc:
+        if shared:
+            add_shared_background(doc, background_color)
+            doc.save(output_pdf_path, garbage=3, deflate=True)
+        else:
+            add_background_per_page(doc, background_color)
+            doc.save(output_pdf_path)
+
+
+def _recolor_shard(input_pdf_path, first, last, shard_path, background_color):
+    """Recolor pages first..last-1 of the input into their own file."""
+    with fitz.open(input_pdf_path) as doc:
+        doc.select(list(range(first, last)))
+        add_shared_background(doc, background_color)
+        doc.save(shard_path, garbage=3, deflate=True)
+    return shard_path
+
+
+def shard_unsafe_structures(doc, shard_pages=SHARD_PAGES):
+    """
+    Document structures that would not survive splitting into shards and
+    joining them again: page labels, name trees (named destinations,
+    attachments...), forms, and internal links that point into another shard.
+    """
+    found = []
+    catalog = doc.pdf_catalog()
+    for key in ("PageLabels", "Names", "Dests", "AcroForm"):
+        if doc.xref_get_key(catalog, key)[0] != "null":
+            found.append(key)
+    for page in doc:
+        shard = page.number // shard_pages
+        for link in page.get_links():
+            if link["kind"] == fitz.LINK_NAMED or (
+                    link["kind"] == fitz.LINK_GOTO and link.get("page", -1) // shard_pages != shard):
+                found.append(f"links across shards (page {page.number + 1})")
+                return found
+    return found
+
+
+def change_background_color_parallel(input_pdf_path, output_pdf_path, background_color, processes=None,
+                                     shard_pages=SHARD_PAGES):
+    """
+    Recolor a large document in page shards on several cores, then join the
+    shards in order. The outline and metadata are copied from the input;
+    garbage collection on the final save merges the shards' identical
+    background XObjects back into one. Documents with structures the join
+    would lose (see shard_unsafe_structures) are recolored serially instead.
+    """
+    with fitz.open(input_pdf_path) as doc:
+        page_count = doc.page_count
+        toc = doc.get_toc(simple=False)
+        metadata = doc.metadata
+        unsafe = shard_unsafe_structures(doc, shard_pages) if page_count > shard_pages else []
+    if page_count <= shard_pages or unsafe:
+        if unsafe:
+            print(f"Recoloring {input_pdf_path} in one piece to keep its {', '.join(unsafe)}")
+        change_background_color(input_pdf_path, output_pdf_path, background_color)
+        return
+
+    shard_dir = tempfile.mkdtemp(prefix="recolor_shards_", dir=os.path.dirname(os.path.abspath(output_pdf_path)))
+    try:
+        bounds = [(first, min(first + shard_pages, page_count)) for first in range(0, page_count, shard_pages)]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            shard_paths = list(pool.map(
+                _recolor_shard,
+                [input_pdf_path] * len(bounds),
+                [first for first, _ in bounds],
+                [last for _, last in bounds],
+                [os.path.join(shard_dir, f"shard{i:05d}.pdf") for i in range(len(bounds))],
+                [background_color] * len(bounds),
+            ))
+        with fitz.open() as joined:
+            for shard_path in shard_paths:
+                with fitz.open(shard_path) as shard:
+                    joined.insert_pdf(shard)
+            joined.set_toc(toc)
+            joined.set_metadata(metadata)
+            joined.save(output_pdf_path, garbage=3, deflate=True)
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+def parse_color(color_str):
+    """Parse "#c8d2b4", "200,210,180" (0-255) or "0.78,0.82,0.71" (0-1) into an RGB tuple of floats."""
+    color_str = color_str.strip()
+    if re.fullmatch(r"#?[0-9a-fA-F]{6}", color_str):
+        value = color_str.lstrip("#")
+        return tuple(int(value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    parts = [p for p in re.split(r"[,\s]+", color_str) if p]
+    try:
+        channels = [float(p) for p in parts]
+    except ValueError:
+        channels = []
+    if len(channels) != 3:
+        raise ValueError(f"Invalid color '{color_str}'. Use #rrggbb, r,g,b (0-255) or r,g,b (0-1).")
+    if any(c > 1 for c in channels):
+        channels = [c / 255 for c in channels]
+    if any(not 0 <= c <= 1 for c in channels):
+        raise ValueError(f"Color channels out of range: '{color_str}'")
+    return tuple(channels)
+
+
+def file_sha256(path, chunk_size=4 * 1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path_for(input_hash, background_color, cache_dir=DEFAULT_CACHE_DIR):
+    color = "".join(f"{round(c * 255):02x}" for c in background_color)
+    # Exact float values too, so two colors rounding to the same hex do not collide
+    exact = hashlib.sha1(repr(tuple(background_color)).encode()).hexdigest()[:8]
+    return os.path.join(cache_dir, input_hash[:2], f"{input_hash}-{color}-{exact}-v{CACHE_VERSION}.pdf")
+
+
+def prune_cache(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    """
+    Delete the least recently used cache entries (by mtime, refreshed on
+    every cache hit) until the cache holds at most max_bytes; max_bytes=0
+    clears it. Returns (entries removed, bytes freed).
+    """
+    entries = []
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    removed = freed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+        freed += size
+    return removed, freed
+
+
+def _clone_file(source, destination):
+    """Copy source to the already open destination, as a reflink where the filesystem supports it."""
+    try:
+        import fcntl
+        with open(source, 'rb') as src:
+            fcntl.ioctl(destination.fileno(), FICLONE, src.fileno())
+        return
+    except (ImportError, OSError):
+        pass
+    with open(source, 'rb') as src:
+        shutil.copyfileobj(src, destination, 4 * 1024 * 1024)
+
+
+def _copy_file(source, target, read_only=False):
+    """Put an independent copy of source at target, replacing target atomically."""
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            _clone_file(source, f)
+        if read_only:
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def recolor_pdf(input_pdf_path, output_pdf_path, background_color=DEFAULT_COLOR, processes=1,
+                shard_pages=SHARD_PAGES, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Recolor one PDF and return what happened: "recolored" or "cached"
+    (copied from the cache).
+    processes > 1 recolors large documents in page shards; the default
+    (and None) is one process. cache_dir=None disables the cache, which
+    is not pruned here: call prune_cache once a run is done.
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_pdf_path))
+    os.makedirs(output_dir, exist_ok=True)
+
+    cached = None
+    if cache_dir:
+        cached = cache_path_for(file_sha256(input_pdf_path), background_color, cache_dir)
+        if os.path.exists(cached):
+            # Mark the entry as recently used for prune_cache
+            os.utime(cached)
+            _copy_file(cached, output_pdf_path)
+            return "cached"
+
+    tmp_path = os.path.join(output_dir, f".{os.path.basename(output_pdf_path)}.{os.getpid()}.tmp")
+    try:
+        if processes is not None and processes > 1:
+            change_background_color_parallel(input_pdf_path, tmp_path, background_color, processes, shard_pages)
+        else:
+            change_background_color(input_pdf_path, tmp_path, background_color)
+        os.replace(tmp_path, output_pdf_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    if cached:
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            _copy_file(output_pdf_path, cached, read_only=True)
+        except OSError as e:
+            print(f"Warning: could not store {output_pdf_path} in the cache: {e}")
+    return "recolored"
+
+
+def _recolor_job(input_pdf_path, output_pdf_path, background_color, cache_dir):
+    start = time.perf_counter()
+    status = None
+    try:
+        status = recolor_pdf(input_pdf_path, output_pdf_path, background_color, cache_dir=cache_dir)
+        error = None
+    except Exception as e:
+        error = str(e)
+    return input_pdf_path, status, error, time.perf_counter() - start
+
+
+def recolor_directory(input_dir, output_dir, background_color, processes=None, cache_dir=DEFAULT_CACHE_DIR,
+                      cache_max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    """
+    Recolor every PDF in input_dir (recursively) into the same layout under
+    output_dir. Files are queued to a process pool, one document per job,
+    and go through the recolor cache, which is pruned to cache_max_bytes
+    at the end. Returns the number of failed files.
+    """
+    jobs = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                source = os.path.join(root, name)
+                target = os.path.join(output_dir, os.path.relpath(source, input_dir))
+                jobs.append((source, target))
+    if not jobs:
+        print("No PDF files found in", input_dir)
+        return 0
+
+    for _, target in jobs:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    print(f"Recoloring {len(jobs)} PDFs with {processes or os.cpu_count()} processes")
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_recolor_job, source, target, background_color, cache_dir)
+                   for source, target in jobs]
+        statuses = {}
+        for done, future in enumerate(as_completed(futures), 1):
+            source, status, error, seconds = future.result()
+            if error:
+                failed += 1
+                print(f"[{done}/{len(jobs)}] FAILED {source}: {error}")
+            else:
+                statuses[status] = statuses.get(status, 0) + 1
+                print(f"[{done}/{len(jobs)}] {status}: {source} ({seconds:.2f}s)")
+    elapsed = time.perf_counter() - start
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())) or "nothing done"
+    print(f"Done: {summary}, {failed} failed in {elapsed:.2f}s "
+          f"({len(jobs) / elapsed if elapsed else 0:.1f} files/s)")
+    if cache_dir:
+        _prune_and_report(cache_dir, cache_max_bytes)
+    return failed
+
+
+def _prune_and_report(cache_dir, max_bytes):
+    removed, freed = prune_cache(cache_dir, max_bytes)
+    if removed:
+        print(f"Cache: removed {removed} old entries ({freed / 2**20:.1f} MiB) from {cache_dir}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Put a solid background color behind every page of a PDF.")
+    parser.add_argument('input', nargs='?', help='Input PDF, or a directory of PDFs')
+    parser.add_argument('output', nargs='?', help='Output PDF, or the output directory for a directory input')
+    parser.add_argument('--color', default="200,210,180",
+                        help='Background as #rrggbb, r,g,b (0-255) or r,g,b (0-1) (default: 200,210,180)')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Worker processes: files in parallel for a directory (default: CPU count); '
+                             'for one file, page shards only when given (default: one process)')
+    parser.add_argument('--shard-pages', type=int, default=SHARD_PAGES,
+                        help=f'Pages per shard for a single large file (default: {SHARD_PAGES})')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'Recolor cache (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Always recolor, without reading or filling the cache')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_CACHE_MAX_BYTES // 2**20,
+                        help='Prune least recently used cache entries past this size after a run '
+                             f'(default: {DEFAULT_CACHE_MAX_BYTES // 2**20})')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='Empty the cache; input/output are then optional')
+    args = parser.parse_args(argv)
+    cache_max_bytes = args.cache_max_mb * 2**20
+
+    if args.clear_cache:
+        removed, freed = prune_cache(args.cache_dir, 0)
+        print(f"Cleared {removed} cache entries ({freed / 2**20:.1f} MiB) from {args.cache_dir}")
+        if args.input is None:
+            return 0
+    if args.input is None or args.output is None:
+        parser.error("input and output are required")
+
+    try:
+        background_color = parse_color(args.color)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    if os.path.isdir(args.input):
+        failed = recolor_directory(args.input, args.output, background_color, args.processes, cache_dir,
+                                   cache_max_bytes)
+        return 1 if failed else 0
+
+    if not os.path.isfile(args.input):
+        print(f"Error: input not found: {args.input}")
+        return 1
+    start = time.perf_counter()
+    try:
+        status = recolor_pdf(args.input, args.output, background_color, args.processes, args.shard_pages, cache_dir)
+    except Exception as e:
+        print(f"Error recoloring {args.input}: {e}")
+        return 1
+    print(f"Background color changed and saved to {args.output} ({status}, {time.perf_counter() - start:.2f}s)")
+    if cache_dir:
+        _prune_and_report(cache_dir, cache_max_bytes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
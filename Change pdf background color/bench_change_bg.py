@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Change_BG_color_PDFs.
+
+Generates a book, recolors it with the old per-page drawing (saved plain
+and with garbage collection + deflate) and with the shared Form XObject,
+and reports recolor time, save time and output size. The sharded
+process-pool recolor is timed end to end (recolor and save together).
+A few pages of both outputs are rendered and compared.
+
+Usage:
+    python bench_change_bg.py --pages 1000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+from Change_BG_color_PDFs import (
+    SHARD_PAGES, add_background_per_page, add_shared_background, change_background_color_parallel,
+)
+
+BACKGROUND_COLOR = (200 / 255, 210 / 255, 180 / 255)
+
+
+def make_book(path, pages):
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {n + 1}", fontsize=18)
+        page.insert_textbox(fitz.Rect(72, 100, 520, 760), "Lorem ipsum dolor sit amet. " * 60, fontsize=10)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def run(mode, book, output, processes=None, shard_pages=SHARD_PAGES):
+    if mode == "sharded":
+        start = time.perf_counter()
+        change_background_color_parallel(book, output, BACKGROUND_COLOR, processes, shard_pages)
+        return None, time.perf_counter() - start, os.path.getsize(output)
+    with fitz.open(book) as doc:
+        start = time.perf_counter()
+        if mode.startswith("per-page"):
+            add_background_per_page(doc, BACKGROUND_COLOR)
+            recolor = time.perf_counter() - start
+            start = time.perf_counter()
+            if mode == "per-page+gc":
+                doc.save(output, garbage=3, deflate=True)
+            else:
+                doc.save(output)
+        else:
+            add_shared_background(doc, BACKGROUND_COLOR)
+            recolor = time.perf_counter() - start
+            start = time.perf_counter()
+            doc.save(output, garbage=3, deflate=True)
+        save = time.perf_counter() - start
+    return recolor, save, os.path.getsize(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-page vs shared background recoloring.")
+    parser.add_argument('--pages', type=int, default=1000, help='Pages in the generated book (default: 1000)')
+    parser.add_argument('--processes', type=int, default=None, help='Workers for the sharded run (default: CPU count)')
+    parser.add_argument('--shard-pages', type=int, default=SHARD_PAGES,
+                        help=f'Pages per shard (default: {SHARD_PAGES})')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bg_bench_")
+    try:
+        book = os.path.join(work_dir, "book.pdf")
+        make_book(book, args.pages)
+        print(f"Generated {args.pages}-page book: {os.path.getsize(book) / 2**20:.2f} MiB")
+        print(f"{'mode':>11} {'recolor s':>10} {'save s':>8} {'MiB':>8}")
+        outputs = {}
+        for mode in ("per-page", "per-page+gc", "shared", "sharded"):
+            outputs[mode] = os.path.join(work_dir, f"{mode}.pdf")
+            recolor, save, size = run(mode, book, outputs[mode], args.processes, args.shard_pages)
+            recolor = "-" if recolor is None else f"{recolor:.2f}"
+            print(f"{mode:>11} {recolor:>10} {save:>8.2f} {size / 2**20:>8.2f}")
+
+        for mode in ("shared", "sharded"):
+            with fitz.open(outputs["per-page"]) as old, fitz.open(outputs[mode]) as new:
+                same = new.page_count == old.page_count and all(
+                    old[n].get_pixmap().samples == new[n].get_pixmap().samples
+                    for n in sorted({0, args.pages // 2, args.pages - 1})
+                )
+                print(f"{mode}: {'renders identically' if same else 'RENDERS DIFFERENTLY'} to per-page")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
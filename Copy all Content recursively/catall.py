@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Concatenate every text file under a directory, framed with its path.
+
+Python engine behind catall.sh, catbyext.sh and catwithextension.sh. The
+tree is walked once, text files are detected by sniffing their first bytes
+(instead of running `file` per file), files are read by a small thread pool
+in output order, and the result is streamed to stdout or the clipboard so
+memory stays bounded on very large trees.
+
+Usage:
+    python catall.py <directory>                 # all text files -> clipboard
+    python catall.py <directory> .py .md         # only these extensions
+    python catall.py <directory> --stdout --max-file-size 200000
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+SNIFF_BYTES = 8192
+SEPARATOR = "==========================================="
+
+
+def is_text_bytes(sample):
+    """Guess whether a file is text from its first bytes, like `file` would."""
+    if not sample:
+        return False  # `file` reports empty files as "empty", not text
+    if b'\0' in sample:
+        return False
+    try:
+        sample.decode('utf-8')
+        return True
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sample size is still text
+        if e.start >= len(sample) - 3 and e.reason == 'unexpected end of data':
+            return True
+    # Latin-1 style text: allow a few control characters besides whitespace
+    control = sum(1 for b in sample if b < 32 and b not in (9, 10, 12, 13, 27))
+    return control / len(sample) < 0.05
+
+
+def _glob_segment_regex(segment):
+    """Regex for one path segment of a gitignore glob: *, ? and [...] never match '/'."""
+    out = []
+    i = 0
+    while i < len(segment):
+        c = segment[i]
+        if c == '*':
+            while i + 1 < len(segment) and segment[i + 1] == '*':
+                i += 1
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '\\' and i + 1 < len(segment):
+            i += 1
+            out.append(re.escape(segment[i]))
+        elif c == '[':
+            # A ']' right after '[' or '[!' is part of the set, not its end
+            start = i + 1
+            if segment[start:start + 1] in ('!', '^'):
+                start += 1
+            if segment[start:start + 1] == ']':
+                start += 1
+            end = segment.find(']', start)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = segment[i + 1:end]
+                negate = body[:1] in ('!', '^')
+                if negate:
+                    body = body[1:]
+                body = body.replace('[', '\\[')
+                if body.startswith(']'):
+                    body = '\\' + body
+                out.append('(?!/)[' + ('^' if negate else '') + body + ']')
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def gitignore_regex(pattern):
+    """
+    Compile a gitignore pattern (leading '/' and trailing '/' already
+    stripped) to a regex matched against a whole relative path. Matching is
+    segment-wise: '**/' matches zero or more directories, a trailing '/**'
+    matches everything inside, and any other '**' acts like '*'.
+    """
+    segments = pattern.split('/')
+    parts = []
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == '**':
+            parts.append('.*' if last else '(?:[^/]+/)*')
+        else:
+            parts.append(_glob_segment_regex(segment) + ('' if last else '/'))
+    return re.compile(''.join(parts) + r'\Z')
+
+
+class GitIgnore:
+    """
+    .gitignore matcher: globs, negation, anchoring, directory-only rules and
+    '**', matched segment by segment as git does. Trailing spaces are always
+    stripped (git keeps them when escaped with a backslash).
+    """
+
+    def __init__(self):
+        self.rules = []  # (base dir, compiled pattern, negated, dir_only, anchored)
+
+    def add_file(self, base, path):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            try:
+                pattern = gitignore_regex(line)
+            except re.error:
+                continue  # git skips patterns it cannot parse too
+            self.rules.append((base, pattern, negated, dir_only, anchored))
+
+    def ignored(self, rel_path, is_dir):
+        result = False
+        for base, pattern, negated, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + '/'):
+                    continue
+                path = rel_path[len(base) + 1:]
+            else:
+                path = rel_path
+            if anchored:
+                matched = pattern.match(path) is not None
+            else:
+                matched = pattern.match(path.rsplit('/', 1)[-1]) is not None
+            if matched:
+                result = not negated
+        return result
+
+
+def walk_files(root, use_gitignore=True):
+    """Return file paths relative to root ("./a/b"), sorted like `find . -type f | sort`."""
+    gitignore = GitIgnore()
+    found = []
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        abs_dir = os.path.join(root, rel_dir) if rel_dir else root
+        if use_gitignore:
+            gitignore.add_file(rel_dir, os.path.join(abs_dir, '.gitignore'))
+        try:
+            entries = list(os.scandir(abs_dir))
+        except OSError as e:
+            print(f"Warning: cannot read {abs_dir}: {e}", file=sys.stderr)
+            continue
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = entry.is_file()
+            except OSError:
+                continue
+            if use_gitignore and (entry.name == '.git' or gitignore.ignored(rel_path, is_dir)):
+                continue
+            if is_dir:
+                stack.append(rel_path)
+            elif is_file:
+                found.append("./" + rel_path)
+    found.sort()
+    return found
+
+
+def matches_extensions(path, extensions):
+    return any(path.endswith(ext) for ext in extensions)
+
+
+def read_file(root, rel_path, extensions, max_file_size):
+    """Return the file's text, or None if it is skipped (binary, too large, unreadable)."""
+    path = os.path.join(root, rel_path[2:])
+    try:
+        if max_file_size and os.path.getsize(path) > max_file_size:
+            print(f"Skipping (over size cap): {rel_path}", file=sys.stderr)
+            return None
+        with open(path, 'rb') as f:
+            sample = f.read(SNIFF_BYTES)
+            # With extensions given the filter is by name only, like catbyext.sh
+            if not extensions and not is_text_bytes(sample):
+                return None
+            data = sample + f.read()
+    except OSError as e:
+        print(f"Warning: cannot read {rel_path}: {e}", file=sys.stderr)
+        return None
+    return data.decode('utf-8', errors='replace')
+
+
+def frame(rel_path, content, style):
+    if style == 'banner':
+        name = os.path.basename(rel_path)
+        return f"-------------------------- [[ FILE {name} ]]  --------------------------\n{content}\n"
+    return f"\n{SEPARATOR}\nFile: {rel_path}\n{SEPARATOR}\n{content}\n\n"
+
+
+def concatenate_directory(root, out, extensions=(), workers=8, use_gitignore=True,
+                          max_file_size=None, max_total=None, style='catall'):
+    """
+    Stream framed file contents to out in sorted path order. At most
+    workers * 2 files are held in memory at once. Returns (files, bytes).
+    """
+    paths = walk_files(root, use_gitignore)
+    if extensions:
+        paths = [p for p in paths if matches_extensions(p, extensions)]
+
+    written_files = 0
+    written_bytes = 0
+    window = max(1, workers) * 2
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = deque()
+        next_path = 0
+        while next_path < len(paths) or pending:
+            # Keep a bounded window of reads in flight, consumed in order
+            while next_path < len(paths) and len(pending) < window:
+                rel_path = paths[next_path]
+                pending.append((rel_path, pool.submit(read_file, root, rel_path, extensions, max_file_size)))
+                next_path += 1
+            rel_path, future = pending.popleft()
+            content = future.result()
+            if content is None:
+                continue
+            # The cap is in bytes, so measure the UTF-8 size rather than characters
+            size = len(content.encode('utf-8'))
+            if max_total and written_bytes + size > max_total:
+                print(f"Stopping: total size cap of {max_total} bytes reached at {rel_path}", file=sys.stderr)
+                for _, f in pending:
+                    f.cancel()
+                break
+            out.write(frame(rel_path, content, style))
+            written_files += 1
+            written_bytes += size
+    return written_files, written_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concatenate all text files under a directory.")
+    parser.add_argument('directory', help='Directory to read')
+    parser.add_argument('extensions', nargs='*', help='Only include files ending with these (e.g. .py .md)')
+    parser.add_argument('--stdout', action='store_true', help='Write to stdout instead of the clipboard')
+    parser.add_argument('--workers', type=int, default=8, help='Threads reading files (default: 8)')
+    parser.add_argument('--no-gitignore', action='store_true', help='Do not apply .gitignore rules')
+    parser.add_argument('--max-file-size', type=int, help='Skip files larger than this many bytes')
+    parser.add_argument('--max-total', type=int, help='Stop once this many bytes have been written')
+    parser.add_argument('--style', choices=['catall', 'banner'], default='catall',
+                        help='Frame format: catall.sh (default) or catwithextension.sh banners')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: not a directory: {args.directory}", file=sys.stderr)
+        sys.exit(1)
+
+    options = dict(extensions=tuple(args.extensions), workers=args.workers,
+                   use_gitignore=not args.no_gitignore, max_file_size=args.max_file_size,
+                   max_total=args.max_total, style=args.style)
+
+    if args.stdout:
+        files, total = concatenate_directory(args.directory, sys.stdout, **options)
+        print(f"{files} files, {total} bytes", file=sys.stderr)
+        return
+
+    try:
+        clip = subprocess.Popen(['xclip', '-selection', 'clipboard'], stdin=subprocess.PIPE,
+                                encoding='utf-8', errors='replace')
+    except FileNotFoundError:
+        print("Error: xclip not found. Install it or use --stdout.", file=sys.stderr)
+        sys.exit(1)
+    files, total = concatenate_directory(args.directory, clip.stdin, **options)
+    clip.stdin.close()
+    clip.wait()
+    if args.extensions:
+        print(f"All matching files are now in your clipboard ({files} files, {total} bytes).")
+    else:
+        print(f"All text files' content (recursively) is now in your clipboard ({files} files, {total} bytes).")
+
+
+if __name__ == "__main__":
+    main()
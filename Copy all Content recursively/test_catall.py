@@ -0,0 +1,139 @@
+"""Segment-wise .gitignore matching in catall's walker."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from catall import GitIgnore, walk_files
+
+
+def matcher(*lines, base=''):
+    folder = tempfile.mkdtemp(prefix="catall_test_")
+    try:
+        path = os.path.join(folder, '.gitignore')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        gitignore = GitIgnore()
+        gitignore.add_file(base, path)
+        return gitignore
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+class GitIgnoreTest(unittest.TestCase):
+    def check(self, gitignore, expected):
+        for (path, is_dir), ignored in expected.items():
+            with self.subTest(path=path, is_dir=is_dir):
+                self.assertEqual(gitignore.ignored(path, is_dir), ignored)
+
+    def test_double_star_in_the_middle_matches_zero_or_more_directories(self):
+        self.check(matcher("a/**/b"), {
+            ("a/b", False): True,
+            ("a/x/b", False): True,
+            ("a/x/y/b", True): True,
+            ("c/a/b", False): False,
+            ("a/bb", False): False,
+            ("a/x/b/c", False): False,
+        })
+
+    def test_leading_double_star_matches_at_any_depth(self):
+        self.check(matcher("**/logs"), {
+            ("logs", True): True,
+            ("x/logs", True): True,
+            ("x/y/logs", False): True,
+            ("x/logs2", True): False,
+        })
+        self.check(matcher("**/logs/debug.log"), {
+            ("logs/debug.log", False): True,
+            ("x/logs/debug.log", False): True,
+            ("x/logs/y/debug.log", False): False,
+        })
+
+    def test_trailing_double_star_matches_everything_inside(self):
+        self.check(matcher("abc/**"), {
+            ("abc", True): False,
+            ("abc/x", False): True,
+            ("abc/x/y", False): True,
+            ("x/abc/y", False): False,
+        })
+
+    def test_star_in_anchored_pattern_stays_in_one_segment(self):
+        self.check(matcher("/build*"), {
+            ("build", True): True,
+            ("build-out", True): True,
+            ("build/x", False): False,
+            ("sub/build", True): False,
+        })
+        self.check(matcher("doc/*.txt"), {
+            ("doc/notes.txt", False): True,
+            ("doc/server/arch.txt", False): False,
+        })
+
+    def test_other_double_stars_act_like_a_single_star(self):
+        self.check(matcher("/a**z"), {
+            ("abcz", False): True,
+            ("a/z", False): False,
+        })
+
+    def test_unanchored_pattern_matches_name_at_any_depth(self):
+        self.check(matcher("*.log", "?.tmp", "[ab]x.py", "[!c]y.py"), {
+            ("x.log", False): True,
+            ("deep/down/x.log", False): True,
+            ("q.tmp", False): True,
+            ("qq.tmp", False): False,
+            ("bx.py", False): True,
+            ("cx.py", False): False,
+            ("dy.py", False): True,
+            ("cy.py", False): False,
+        })
+
+    def test_negation_and_directory_only_rules(self):
+        self.check(matcher("*.log", "!keep.log", "cache/"), {
+            ("x.log", False): True,
+            ("keep.log", False): False,
+            ("cache", True): True,
+            ("cache", False): False,
+        })
+
+    def test_escaped_special_characters_are_literal(self):
+        self.check(matcher("\\#notes", "\\!important", "a\\*"), {
+            ("#notes", False): True,
+            ("!important", False): True,
+            ("a*", False): True,
+            ("ab", False): False,
+        })
+
+    def test_rules_from_a_subdirectory_apply_below_it_only(self):
+        self.check(matcher("/out", "**/gen/*.py", base="pkg"), {
+            ("pkg/out", True): True,
+            ("out", True): False,
+            ("pkg/sub/out", True): False,
+            ("pkg/gen/a.py", False): True,
+            ("pkg/x/gen/a.py", False): True,
+            ("gen/a.py", False): False,
+        })
+
+
+class WalkFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="catall_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_walk_skips_ignored_paths(self):
+        for rel in ("a/b", "a/x/y/b", "a/keep", "build1/f", "src/build1", "src/main.py"):
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("text\n")
+        with open(os.path.join(self.root, '.gitignore'), 'w', encoding='utf-8') as f:
+            f.write("a/**/b\n/build*\n")
+
+        self.assertEqual(walk_files(self.root),
+                         ["./.gitignore", "./a/keep", "./src/build1", "./src/main.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
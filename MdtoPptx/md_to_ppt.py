@@ -1,5 +1,11 @@
+import argparse
+import copy
+import json
+import os
 import sys
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pptx import Presentation
 from pptx.util import Inches, Pt
 
@@ -36,8 +42,7 @@ def parse_markdown(file_path):
 
     return slides
 
-def create_pptx(slides, output_path):
-    prs = Presentation()
+def build_presentation(slides, prs):
     # Use a title and content layout (usually layout index 1)
     slide_layout = prs.slide_layouts[1]
 
@@ -57,12 +62,129 @@ def create_pptx(slides, output_path):
                 p.text = bullet
                 p.level = 1  # nested bullet
                 p.font.size = Pt(18)
+    return prs
+
+def create_pptx(slides, output_path, template_path=None):
+    prs = build_presentation(slides, Presentation(template_path))
     prs.save(output_path)
     print(f"Presentation saved to {output_path}")
 
+# Template loaded once per batch worker; every deck starts from a deep copy of it
+_worker_template = None
+
+def _init_batch_worker(template_path):
+    global _worker_template
+    _worker_template = Presentation(template_path)
+
+def _convert_deck(input_md, output_pptx):
+    start = time.perf_counter()
+    try:
+        slides = parse_markdown(input_md)
+        prs = build_presentation(slides, copy.deepcopy(_worker_template))
+        os.makedirs(os.path.dirname(output_pptx) or '.', exist_ok=True)
+        prs.save(output_pptx)
+        return input_md, output_pptx, len(slides), time.perf_counter() - start, None
+    except Exception as e:
+        return input_md, output_pptx, 0, time.perf_counter() - start, str(e)
+
+def find_markdown_jobs(input_dir, output_dir):
+    """(input .md, output .pptx) for every markdown file under input_dir, keeping subfolders."""
+    jobs = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith('.md'):
+                input_md = os.path.join(root, name)
+                relative = os.path.relpath(input_md, input_dir)
+                jobs.append((input_md, os.path.join(output_dir, os.path.splitext(relative)[0] + '.pptx')))
+    return jobs
+
+def load_manifest(manifest_path, output_dir=None):
+    """
+    Read a JSON manifest: {"template": ..., "output_dir": ..., "decks": [{"input": ..., "output": ...}]}
+    or just the list of decks. Relative paths are relative to the manifest; a deck
+    without "output" goes to output_dir as <input name>.pptx.
+    Returns (jobs, template path or None).
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    if isinstance(data, list):
+        data = {"decks": data}
+    output_dir = output_dir or os.path.join(base_dir, data.get("output_dir", "."))
+    template = data.get("template")
+    if template:
+        template = os.path.join(base_dir, template)
+
+    jobs = []
+    for deck in data.get("decks", []):
+        if isinstance(deck, str):
+            deck = {"input": deck}
+        input_md = os.path.join(base_dir, deck["input"])
+        if deck.get("output"):
+            output_pptx = os.path.join(base_dir, deck["output"])
+        else:
+            output_pptx = os.path.join(output_dir, os.path.splitext(os.path.basename(input_md))[0] + '.pptx')
+        jobs.append((input_md, output_pptx))
+    return jobs, template
+
+def convert_batch(jobs, processes=None, template_path=None):
+    """
+    Convert (input .md, output .pptx) pairs in a process pool and print the
+    time of each deck and of the whole run. Returns (converted, failed).
+    """
+    processes = processes or os.cpu_count() or 1
+    converted = failed = 0
+    deck_seconds = 0.0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_batch_worker,
+                             initargs=(template_path,)) as pool:
+        futures = [pool.submit(_convert_deck, input_md, output_pptx) for input_md, output_pptx in jobs]
+        for future in as_completed(futures):
+            input_md, output_pptx, slide_count, seconds, error = future.result()
+            deck_seconds += seconds
+            if error:
+                failed += 1
+                print(f"Failed {input_md}: {error}")
+            else:
+                converted += 1
+                print(f"{input_md} -> {output_pptx}: {slide_count} slides in {seconds:.2f}s")
+
+    elapsed = time.perf_counter() - start
+    print(f"Converted {converted} decks ({failed} failed) in {elapsed:.2f}s "
+          f"with {processes} processes ({deck_seconds:.2f}s of deck time)")
+    return converted, failed
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(description="Convert many markdown files to PowerPoint decks in parallel.")
+    parser.add_argument('--batch', required=True, metavar='DIR_OR_MANIFEST',
+                        help='Folder of .md files or a JSON manifest of decks')
+    parser.add_argument('output_dir', nargs='?', help='Output folder (default: next to the inputs)')
+    parser.add_argument('--processes', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--template', help='.pptx template to start every deck from')
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.batch):
+        jobs = find_markdown_jobs(args.batch, args.output_dir or args.batch)
+        template = args.template
+    else:
+        jobs, template = load_manifest(args.batch, args.output_dir)
+        template = args.template or template
+    if not jobs:
+        print(f"No markdown files found in {args.batch}")
+        sys.exit(1)
+    _, failed = convert_batch(jobs, args.processes, template)
+    if failed:
+        sys.exit(1)
+
 def main():
+    if '--batch' in sys.argv[1:]:
+        batch_main(sys.argv[1:])
+        return
     if len(sys.argv) != 3:
         print("Usage: python md_to_ppt.py <input_markdown_file> <output_pptx_file>")
+        print("       python md_to_ppt.py --batch <folder|manifest.json> [output_folder] [--processes N] [--template T]")
         sys.exit(1)
     input_md = sys.argv[1]
     output_pptx = sys.argv[2]
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark for cat_all_md on a synthetic vault.
+
+Generates a reproducible vault (note count, directory depth, link fan-out,
+link cycles, note size), then times and memory-profiles link resolution,
+the recursive crawl and the bundle writer separately. Results are written
+as JSON so runs from different commits can be compared.
+
+Usage:
+    python bench_cat_all_md.py --notes 5000 --fanout 4 --output bench.json
+    python bench_cat_all_md.py --compare old.json new.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cat_all_md
+from note_cache import NoteCache
+from note_index import NoteIndex
+
+
+def generate_vault(root, notes=1000, dir_depth=3, dirs_per_level=4, fanout=3,
+                   cycle_ratio=0.1, note_bytes=2000, seed=0):
+    """
+    Write a synthetic vault under root and return the path of a parent note.
+    Notes link mostly "forward" (to higher-numbered notes); cycle_ratio of
+    the links point backwards to create cycles.
+    """
+    rng = random.Random(seed)
+    dirs = [root]
+    level = [root]
+    for _ in range(dir_depth):
+        level = [os.path.join(d, f"dir{i}") for d in level for i in range(dirs_per_level)]
+        dirs.extend(level)
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    header = "".join(f"meta: {i}\n" for i in range(10))
+    filler_line = "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n"
+    for i in range(notes):
+        links = []
+        for _ in range(fanout):
+            if i > 0 and rng.random() < cycle_ratio:
+                target = rng.randrange(0, i)
+            else:
+                target = rng.randrange(i, notes)
+            links.append(f"[[Note {target}]]")
+        body_lines = max(1, note_bytes // len(filler_line))
+        body = filler_line * body_lines
+        with open(os.path.join(rng.choice(dirs), f"Note {i}.md"), 'w', encoding='utf-8') as f:
+            f.write(header)
+            f.write(body)
+            f.write(" ".join(links) + "\n\n\n")
+
+    parent_path = os.path.join(root, "Bench Parent.md")
+    with open(parent_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.write(" ".join(f"[[Note {rng.randrange(notes)}]]" for _ in range(fanout * 2)) + "\n")
+    return parent_path
+
+
+def measure(func, repeat=1):
+    """Run func quietly, returning (result, best seconds, peak traced bytes)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Memory is measured in a separate run so tracing does not skew the timing
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+def run_benchmark(args):
+    work_dir = tempfile.mkdtemp(prefix="cat_all_md_bench_")
+    vault = os.path.join(work_dir, "vault")
+    results = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "params": {
+            "notes": args.notes, "dir_depth": args.dir_depth, "dirs_per_level": args.dirs_per_level,
+            "fanout": args.fanout, "cycle_ratio": args.cycle_ratio, "note_bytes": args.note_bytes,
+            "max_depth": args.depth, "seed": args.seed,
+        },
+        "timings": {},
+    }
+    timings = results["timings"]
+
+    def record(name, seconds, peak, **extra):
+        timings[name] = {"seconds": round(seconds, 6), "peak_bytes": peak, **extra}
+        print(f"{name:<32} {seconds * 1000:10.2f} ms  {peak / 1024:10.1f} KiB")
+
+    try:
+        start = time.perf_counter()
+        parent = generate_vault(vault, args.notes, args.dir_depth, args.dirs_per_level, args.fanout,
+                                args.cycle_ratio, args.note_bytes, args.seed)
+        print(f"Generated {args.notes} notes in {time.perf_counter() - start:.2f}s: {vault}")
+        print("-" * 70)
+
+        rng = random.Random(args.seed + 1)
+        lookups = [f"Note {rng.randrange(args.notes)}" for _ in range(args.lookups)]
+        index_path = os.path.join(work_dir, "index.json")
+
+        _, seconds, peak = measure(lambda: [cat_all_md.find_markdown_file(n, vault) for n in lookups])
+        record("find_markdown_file[walk]", seconds, peak, lookups=len(lookups))
+
+        index, seconds, peak = measure(lambda: NoteIndex.load(vault, index_path))
+        record("note_index[build]", seconds, peak)
+        index.save()
+
+        _, seconds, peak = measure(lambda: NoteIndex.load(vault, index_path), args.repeat)
+        record("note_index[reload]", seconds, peak)
+
+        _, seconds, peak = measure(lambda: [cat_all_md.find_markdown_file(n, vault, index) for n in lookups],
+                                   args.repeat)
+        record("find_markdown_file[index]", seconds, peak, lookups=len(lookups))
+
+        refs = cat_all_md.read_parent_file(parent)
+
+        files, seconds, peak = measure(
+            lambda: cat_all_md.collect_all_references_recursive(refs, vault, args.depth, index=index),
+            args.repeat)
+        record("collect[uncached]", seconds, peak, files=len(files))
+
+        cache = NoteCache(os.path.join(work_dir, "notes.sqlite3"))
+        files, seconds, peak = measure(
+            lambda: cat_all_md.collect_all_references_recursive(refs, vault, args.depth, index=index, cache=cache),
+            args.repeat)
+        record("collect[cached]", seconds, peak, files=len(files))
+
+        if args.workers > 1:
+            files, seconds, peak = measure(
+                lambda: cat_all_md.collect_all_references_parallel(
+                    refs, vault, args.depth, index=index, cache=NoteCache(), workers=args.workers))
+            record(f"collect[parallel x{args.workers}]", seconds, peak, files=len(files))
+
+        output = os.path.join(work_dir, "bundle.md")
+        _, seconds, peak = measure(
+            lambda: cat_all_md.concatenate_notes(parent, vault, output, args.depth, index=index,
+                                                 cache=NoteCache(), force=True))
+        record("concatenate_notes[cold]", seconds, peak, output_bytes=os.path.getsize(output))
+
+        _, seconds, peak = measure(
+            lambda: cat_all_md.concatenate_notes(parent, vault, output, args.depth, index=index,
+                                                 cache=cache, force=True), args.repeat)
+        record("concatenate_notes[warm]", seconds, peak, output_bytes=os.path.getsize(output))
+
+        _, seconds, peak = measure(
+            lambda: cat_all_md.concatenate_notes(parent, vault, output, args.depth, index=index, cache=cache),
+            args.repeat)
+        record("concatenate_notes[up to date]", seconds, peak)
+        cache.close()
+    finally:
+        if args.keep:
+            print(f"Kept benchmark files in: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def compare(old_path, new_path):
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+    if old.get("params") != new.get("params"):
+        print("WARNING: benchmark parameters differ between the two runs")
+    print(f"{'benchmark':<32} {'old ms':>10} {'new ms':>10} {'change':>8}")
+    for name, entry in new["timings"].items():
+        before = old["timings"].get(name)
+        if before is None:
+            print(f"{name:<32} {'-':>10} {entry['seconds'] * 1000:10.2f}")
+            continue
+        change = (entry["seconds"] / before["seconds"] - 1) * 100 if before["seconds"] else 0
+        print(f"{name:<32} {before['seconds'] * 1000:10.2f} {entry['seconds'] * 1000:10.2f} {change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cat_all_md on a synthetic vault.")
+    parser.add_argument('--notes', type=int, default=2000, help='Number of notes (default: 2000)')
+    parser.add_argument('--dir-depth', type=int, default=3, help='Directory nesting depth (default: 3)')
+    parser.add_argument('--dirs-per-level', type=int, default=4, help='Subdirectories per directory (default: 4)')
+    parser.add_argument('--fanout', type=int, default=3, help='Links per note (default: 3)')
+    parser.add_argument('--cycle-ratio', type=float, default=0.1, help='Share of backward links (default: 0.1)')
+    parser.add_argument('--note-bytes', type=int, default=2000, help='Approximate note body size (default: 2000)')
+    parser.add_argument('--depth', type=int, default=3, help='Crawl depth (default: 3)')
+    parser.add_argument('--lookups', type=int, default=200, help='Name lookups to time (default: 200)')
+    parser.add_argument('--workers', type=int, default=8, help='Threads for the parallel crawl (default: 8)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark, best is kept (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated vault')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two JSON result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run_benchmark(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
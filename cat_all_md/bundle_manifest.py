@@ -0,0 +1,162 @@
+"""
+Dependency manifest written next to each combined bundle.
+
+Records the options used, the parent note, the path every linked note name
+resolved to (null for a missing note) and, for every section of the output,
+the note it came from with its (mtime, size) and the byte range and hash of
+the section. The next build uses it to skip unchanged bundles and to copy
+unchanged sections from the previous output instead of rendering them again.
+
+Only the resolution of the names the bundle links to is checked, not the
+vault's directory mtimes: a bundle written into the vault changes its
+directory's mtime on every build, which would otherwise make every
+bundle in that directory look stale.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 2
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_path_for(output_file):
+    return output_file + MANIFEST_SUFFIX
+
+
+def file_key(path):
+    """Return [mtime_ns, size] for a file, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_manifest(output_file):
+    try:
+        with open(manifest_path_for(output_file), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"WARNING: Ignoring unreadable manifest for {output_file}: {e}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(output_file, manifest):
+    path = manifest_path_for(output_file)
+    tmp_path = path + ".tmp"
+    manifest["version"] = MANIFEST_VERSION
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def bundle_options(parent_file_path, search_folder, max_depth, compression):
+    return {
+        "parent": os.path.abspath(parent_file_path),
+        "search_folder": os.path.abspath(search_folder),
+        "max_depth": max_depth,
+        "compression": compression,
+    }
+
+
+def is_up_to_date(manifest, output_file, options, index):
+    """
+    True when the bundle can be skipped: same options, same parent note,
+    every linked name still resolves to the same note (or is still missing)
+    and every included note is unchanged.
+    """
+    if manifest is None or manifest.get("options") != options:
+        return False
+    for note_name, path in manifest["resolved"].items():
+        if index.find(note_name) != path:
+            return False
+    if file_key(options["parent"]) != manifest.get("parent_key"):
+        return False
+    if file_key(output_file) != manifest.get("output_key"):
+        return False
+    for section in manifest["sections"]:
+        if file_key(section["path"]) != section["key"]:
+            return False
+    return True
+
+
+def reusable_sections(manifest, output_file, compression):
+    """
+    Map (note_name, path, key) to the byte range of sections that can be
+    copied from the previous output. Only plain-text outputs can be copied.
+    """
+    if manifest is None or compression is not None:
+        return {}
+    if file_key(output_file) != manifest.get("output_key"):
+        return {}
+    return {
+        (s["name"], s["path"], tuple(s["key"])): s
+        for s in manifest["sections"]
+    }
+
+
+class SectionWriter:
+    """Text writer proxy that tracks the byte offset and hash of each section."""
+
+    def __init__(self, outfile):
+        self.outfile = outfile
+        self.offset = 0
+        self.section_start = 0
+        self.hash = None
+
+    def begin_section(self):
+        self.section_start = self.offset
+        self.hash = hashlib.sha1()
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self.offset += len(data)
+        if self.hash is not None:
+            self.hash.update(data)
+        return self.outfile.write(text)
+
+    def end_section(self):
+        digest = self.hash.hexdigest()
+        self.hash = None
+        return self.section_start, self.offset - self.section_start, digest
+
+
+def copy_section(old_output, section, writer, chunk_size=1024 * 1024):
+    """
+    Copy one section from the previous output through writer. Returns False
+    (and writes nothing) if the old bytes no longer match the recorded hash.
+    """
+    def read_chunks(f):
+        f.seek(section["offset"])
+        remaining = section["length"]
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                raise EOFError("previous output is shorter than its manifest")
+            remaining -= len(data)
+            yield data
+
+    with open(old_output, 'rb') as f:
+        digest = hashlib.sha1()
+        try:
+            for data in read_chunks(f):
+                digest.update(data)
+        except EOFError:
+            return False
+        if digest.hexdigest() != section["sha1"]:
+            return False
+
+        # Decode incrementally so a multi-byte character split across chunks is kept intact
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for data in read_chunks(f):
+            writer.write(decoder.decode(data))
+        writer.write(decoder.decode(b'', final=True))
+    return True
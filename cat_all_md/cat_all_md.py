@@ -1,13 +1,31 @@
+import argparse
+import contextlib
+import gzip
+import io
+import json
 import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from bundle_manifest import (
+    SectionWriter, bundle_options, copy_section, file_key, is_up_to_date, load_manifest,
+    reusable_sections, save_manifest,
+)
+from note_cache import CHUNK_SIZE, NoteCache, iter_body_chunks, parse_note_lines
+from note_index import NoteIndex
 
 def extract_note_references(content):
     pattern = r'\[\[([^\]]+)\]\]'
     matches = re.findall(pattern, content)
     return matches
 
-def find_markdown_file(note_name, search_path):
+def find_markdown_file(note_name, search_path, index=None):
+    # Use the prebuilt vault index when available (one dict lookup)
+    if index is not None:
+        return index.find(note_name)
+
     for root, dirs, files in os.walk(search_path):
         # Try exact match first
         exact_match = note_name + ".md"
@@ -40,8 +58,11 @@ def read_parent_file(parent_file_path):
         print(f"ERROR reading parent file: {e}")
         return []
 
-def get_note_references_from_file(file_path):
+def get_note_references_from_file(file_path, cache=None):
     try:
+        if cache is not None:
+            return cache.get_references(file_path)
+
         with open(file_path, 'r', encoding='utf-8') as file:
             lines = file.readlines()
 
@@ -56,7 +77,8 @@ def get_note_references_from_file(file_path):
         print(f"ERROR reading file {file_path}: {e}")
         return []
 
-def collect_all_references_recursive(initial_references, search_folder, max_depth=3, processed_files=None, current_depth=0):
+def collect_all_references_recursive(initial_references, search_folder, max_depth=3, processed_files=None, current_depth=0, index=None, cache=None, resolved=None):
+    # resolved, if given, records every note name looked up and the path it resolved to (None if missing)
     if processed_files is None:
         processed_files = set()
 
@@ -68,7 +90,9 @@ def collect_all_references_recursive(initial_references, search_folder, max_dept
             print(f"Level {current_depth + 1}: Skipping duplicate {note_name}")
             continue
 
-        file_path = find_markdown_file(note_name, search_folder)
+        file_path = find_markdown_file(note_name, search_folder, index)
+        if resolved is not None:
+            resolved[note_name] = file_path
         if file_path:
             all_files.append((note_name, file_path))
             processed_files.add(note_name)
@@ -76,12 +100,13 @@ def collect_all_references_recursive(initial_references, search_folder, max_dept
 
             # Recursively process references from this file (depth-first)
             if current_depth < max_depth - 1:  # Don't process references at max depth
-                nested_refs = get_note_references_from_file(file_path)
+                nested_refs = get_note_references_from_file(file_path, cache)
                 if nested_refs:
                     print(f"Level {current_depth + 1}: {note_name} has {len(nested_refs)} nested references: {nested_refs}")
                     # Recursively collect nested references (depth-first)
                     nested_files = collect_all_references_recursive(
-                        nested_refs, search_folder, max_depth, processed_files, current_depth + 1
+                        nested_refs, search_folder, max_depth, processed_files, current_depth + 1, index, cache,
+                        resolved
                     )
                     all_files.extend(nested_files)
         else:
@@ -89,79 +114,464 @@ def collect_all_references_recursive(initial_references, search_folder, max_dept
 
     return all_files
 
-def concatenate_notes(parent_file_path, search_folder, output_file, max_depth=3):
+def prefetch_references(initial_references, max_depth, index, cache, workers):
+    """
+    Read every note the depth-first crawl could expand, one depth level at a
+    time, with a thread pool. This only warms the cache; the crawl itself
+    stays serial so ordering and dedup are unchanged.
+    """
+    seen = set()
+    level = initial_references
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Notes found at the last level are never expanded, so skip reading them
+        for _ in range(max_depth - 1):
+            paths = []
+            for note_name in level:
+                file_path = index.find(note_name)
+                if file_path and file_path not in seen:
+                    seen.add(file_path)
+                    paths.append(file_path)
+            if not paths:
+                break
+
+            next_level = []
+            for refs in pool.map(lambda p: get_note_references_from_file(p, cache), paths):
+                next_level.extend(refs)
+            level = next_level
+
+def collect_all_references_parallel(initial_references, search_folder, max_depth=3, index=None, cache=None, workers=8, resolved=None):
+    """
+    Same result as collect_all_references_recursive, with file reads done
+    concurrently per depth level before the depth-first walk.
+    """
+    if index is not None and cache is not None and workers > 1:
+        prefetch_references(initial_references, max_depth, index, cache, workers)
+    return collect_all_references_recursive(
+        initial_references, search_folder, max_depth, index=index, cache=cache, resolved=resolved
+    )
+
+def load_note_index(search_folder):
+    print(f"Indexing notes in: {search_folder}")
+    index = NoteIndex.load(search_folder)
+    index.save()
+    print(f"Indexed {len(index)} notes")
+    return index
+
+def prune_note_cache(cache, index):
+    # Drop cached rows of notes that were deleted or renamed since they were read
+    removed = cache.prune(index)
+    if removed:
+        print(f"Removed {removed} deleted notes from the note cache")
+
+def read_note_body(file_path, cache=None):
+    if cache is not None:
+        return cache.get_body(file_path)
+
+    with open(file_path, 'r', encoding='utf-8') as infile:
+        return parse_note_lines(infile.readlines())[0]
+
+def stream_note_body(file_path, outfile, chunk_size=CHUNK_SIZE):
+    """
+    Copy a note body to outfile in fixed-size chunks. Whitespace after the
+    last line with content is held back and dropped at the end, which matches
+    removing trailing empty lines without loading the note.
+    """
+    pending = ''        # whitespace not yet known to be followed by content
+    line_open = False   # pending continues the last line that had content
+    with open(file_path, 'r', encoding='utf-8') as infile:
+        for chunk in iter_body_chunks(infile, chunk_size):
+            content_end = len(chunk.rstrip())
+            if content_end == 0:
+                if line_open:
+                    newline = chunk.find('\n')
+                    if newline != -1:
+                        # The line with content ends here; keep its newline
+                        outfile.write(pending + chunk[:newline + 1])
+                        pending = chunk[newline + 1:]
+                        line_open = False
+                        continue
+                pending += chunk
+                continue
+
+            outfile.write(pending)
+            outfile.write(chunk[:content_end])
+            rest = chunk[content_end:]
+            newline = rest.find('\n')
+            if newline != -1:
+                outfile.write(rest[:newline + 1])
+                pending = rest[newline + 1:]
+                line_open = False
+            else:
+                pending = rest
+                line_open = True
+
+    if line_open:
+        # Final line had no newline: keep its trailing spaces like readlines() would
+        outfile.write(pending)
+
+def resolve_compression(output_file, compression=None):
+    if compression is None:
+        if output_file.endswith('.gz'):
+            return 'gzip'
+        if output_file.endswith('.zst'):
+            return 'zstd'
+    return compression
+
+def open_output(output_file, compression=None):
+    """Open the bundle for writing as plain text, gzip or zstd."""
+    compression = resolve_compression(output_file, compression)
+
+    if compression == 'gzip':
+        return gzip.open(output_file, 'wt', encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd output needs the zstandard package (pip install zstandard)")
+        raw = open(output_file, 'wb')
+        writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(writer, encoding='utf-8')
+    return open(output_file, 'w', encoding='utf-8')
+
+def concatenate_notes(parent_file_path, search_folder, output_file, max_depth=3, index=None, cache=None, workers=1, compression=None, force=False):
+    """
+    Build the bundle for parent_file_path. Unless force is set, a bundle whose
+    manifest shows nothing changed is skipped and unchanged sections are
+    copied from the previous output. Returns True if the output was written.
+    """
+    if index is None:
+        index = load_note_index(search_folder)
+
+    compression = resolve_compression(output_file, compression)
+    options = bundle_options(parent_file_path, search_folder, max_depth, compression)
+    manifest = None if force else load_manifest(output_file)
+    if is_up_to_date(manifest, output_file, options, index):
+        print(f"Up to date: {output_file}")
+        return False
+
     print(f"Reading parent file: {parent_file_path}")
+    parent_key = file_key(parent_file_path)
     initial_references = read_parent_file(parent_file_path)
 
     if not initial_references:
         print("ERROR: No note references found in parent file.")
-        return
+        return False
 
     print(f"Found {len(initial_references)} initial note references: {initial_references}")
     print(f"Starting recursive collection with max depth: {max_depth}")
 
+    owns_cache = cache is None
+    if owns_cache:
+        cache = NoteCache.open_default()
+
+    resolved = {}
+    try:
+        sections = write_concatenated_notes(
+            initial_references, search_folder, output_file, max_depth, index, cache, workers,
+            compression, reusable_sections(manifest, output_file, compression), resolved
+        )
+    finally:
+        if owns_cache:
+            prune_note_cache(cache, index)
+            cache.close()
+        else:
+            cache.flush()
+
+    if sections is None:
+        return False
+    try:
+        save_manifest(output_file, {
+            "options": options,
+            "parent_key": parent_key,
+            "resolved": resolved,
+            "output_key": file_key(output_file),
+            "sections": sections,
+        })
+    except Exception as e:
+        print(f"WARNING: Could not write manifest for {output_file}: {e}")
+    return True
+
+def write_concatenated_notes(initial_references, search_folder, output_file, max_depth, index, cache, workers=1, compression=None, previous_sections=None, resolved=None):
+    """
+    Write the bundle to a temporary file and move it over output_file.
+    Returns the manifest sections, or None if nothing was written. Every note
+    name looked up during the crawl is recorded in resolved.
+    """
     # Collect all references recursively (depth-first)
-    all_files = collect_all_references_recursive(initial_references, search_folder, max_depth)
+    all_files = collect_all_references_parallel(
+        initial_references, search_folder, max_depth, index=index, cache=cache, workers=workers,
+        resolved=resolved
+    )
 
     if not all_files:
         print("ERROR: No files found to process.")
-        return
+        return None
 
     print(f"\nTotal unique files collected: {len(all_files)}")
 
     # Write concatenated content
     print(f"\nWriting to: {output_file}")
+    previous_sections = previous_sections or {}
+    sections = []
+    reused = 0
+    tmp_output = output_file + ".tmp"
     try:
-        with open(output_file, 'w', encoding='utf-8') as outfile:
+        with open_output(tmp_output, compression) as outfile:
+            writer = SectionWriter(outfile)
             for note_name, file_path in all_files:
-                print(f"Processing: {note_name}")
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as infile:
-                        lines = infile.readlines()
-
-                        # Skip the first 10 lines and get the rest of the content
-                        if len(lines) > 10:
-                            content_lines = lines[10:]
-                        else:
-                            content_lines = []
-
-                        # Remove trailing empty lines
-                        while content_lines and content_lines[-1].strip() == '':
-                            content_lines.pop()
-
-                        content = ''.join(content_lines)
-
-                        outfile.write(f"# {note_name}\n\n")
-                        outfile.write(content)
-                        outfile.write("\n\n---\n\n")
-                except Exception as e:
-                    print(f"ERROR reading {file_path}: {e}")
-
+                key = file_key(file_path)
+                previous = previous_sections.get((note_name, file_path, tuple(key or ())))
+                writer.begin_section()
+                if previous is not None and copy_section(output_file, previous, writer):
+                    reused += 1
+                else:
+                    print(f"Processing: {note_name}")
+                    write_note_section(writer, note_name, file_path, cache)
+                offset, length, digest = writer.end_section()
+                sections.append({"name": note_name, "path": file_path, "key": key,
+                                 "offset": offset, "length": length, "sha1": digest})
+
+        os.replace(tmp_output, output_file)
         print(f"Successfully created: {output_file}")
-        print(f"Processed {len(all_files)} unique files")
+        print(f"Processed {len(all_files)} unique files ({reused} unchanged sections reused)")
+        return sections
 
     except Exception as e:
         print(f"ERROR writing output file: {e}")
+        if os.path.exists(tmp_output):
+            os.remove(tmp_output)
+        return None
+
+def write_note_section(outfile, note_name, file_path, cache):
+    try:
+        content = read_note_body(file_path, cache)
+
+        outfile.write(f"# {note_name}\n\n")
+        if content is None:
+            # Too large to cache: stream it straight from disk
+            stream_note_body(file_path, outfile)
+        else:
+            outfile.write(content)
+        outfile.write("\n\n---\n\n")
+    except Exception as e:
+        print(f"ERROR reading {file_path}: {e}")
+
+def bundle_is_current(parent_file_path, search_folder, output_file, max_depth, index, compression=None):
+    options = bundle_options(parent_file_path, search_folder, max_depth,
+                             resolve_compression(output_file, compression))
+    return is_up_to_date(load_manifest(output_file), output_file, options, index)
+
+def watch_notes(parent_file_path, search_folder, output_file, max_depth=3, interval=5.0, workers=1, compression=None):
+    """Poll the vault and rebuild the bundle whenever something it depends on changes."""
+    index = load_note_index(search_folder)
+    cache = NoteCache.open_default()
+    print(f"Watching for changes every {interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            if index.refresh():
+                index.save()
+                prune_note_cache(cache, index)
+            if bundle_is_current(parent_file_path, search_folder, output_file, max_depth, index, compression):
+                time.sleep(interval)
+                continue
+            if concatenate_notes(parent_file_path, search_folder, output_file, max_depth,
+                                 index=index, cache=cache, workers=workers, compression=compression):
+                print(f"Rebuilt at {time.strftime('%H:%M:%S')}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        cache.close()
 
 # Configuration
 SEARCH_FOLDER = "/home/codsalah/Documents/salah-space/3. Notes/"
 PARENT_FILE = os.path.join(SEARCH_FOLDER, "SQL ITI Database (RAMI).md") 
 OUTPUT_FILE = os.path.join(SEARCH_FOLDER, "CombinedITISQLNotes__.md")
 
+def load_batch_jobs(batch_file, search_folder, default_depth=3):
+    """
+    Read a JSON batch file: a list of {"parent", "output", "depth"} jobs, or an
+    object with "search_folder" and "jobs". Relative paths are resolved
+    against the search folder.
+    """
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        search_folder = data.get("search_folder", search_folder)
+        data = data.get("jobs", [])
+
+    jobs = []
+    for entry in data:
+        jobs.append({
+            "parent": os.path.join(search_folder, entry["parent"]),
+            "output": os.path.join(search_folder, entry["output"]),
+            "depth": int(entry.get("depth", default_depth)),
+        })
+    return search_folder, jobs
+
+_worker_index = None
+_worker_cache = None
+
+def _init_batch_worker(index):
+    global _worker_index, _worker_cache
+    _worker_index = index
+    _worker_cache = NoteCache.open_default()
+
+def _run_batch_job(job, search_folder, compression, force):
+    log = io.StringIO()
+    start = time.perf_counter()
+    built = False
+    error = None
+    try:
+        with contextlib.redirect_stdout(log):
+            current = not force and bundle_is_current(job["parent"], search_folder, job["output"],
+                                                      job["depth"], _worker_index, compression)
+            if not current:
+                built = concatenate_notes(job["parent"], search_folder, job["output"], job["depth"],
+                                          index=_worker_index, cache=_worker_cache,
+                                          compression=compression, force=force)
+                if not built:
+                    error = "bundle was not written"
+    except Exception as e:
+        error = str(e)
+    elapsed = time.perf_counter() - start
+
+    manifest = load_manifest(job["output"]) or {"sections": []}
+    sections = manifest["sections"]
+    return {
+        "output": job["output"],
+        "built": built,
+        "error": error,
+        "seconds": elapsed,
+        "notes": len(sections),
+        "bytes": sum(s["length"] for s in sections),
+        "log": log.getvalue(),
+    }
+
+def run_batch(batch_file, search_folder, default_depth=3, processes=None, compression=None, force=False):
+    """Build every bundle in a batch file in worker processes sharing one index and note cache."""
+    search_folder, jobs = load_batch_jobs(batch_file, search_folder, default_depth)
+    if not os.path.isdir(search_folder):
+        print(f"ERROR: Search folder not found: {search_folder}")
+        return []
+    if not jobs:
+        print("ERROR: No jobs found in batch file.")
+        return []
+
+    index = load_note_index(search_folder)
+    print(f"Building {len(jobs)} bundles with {processes or os.cpu_count()} processes")
+    print("-" * 50)
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_batch_worker, initargs=(index,)) as pool:
+        futures = [pool.submit(_run_batch_job, job, search_folder, compression, force) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            name = os.path.basename(result["output"])
+            if result["error"]:
+                print(f"FAILED {name}: {result['error']}")
+                print(result["log"])
+            else:
+                status = "built" if result["built"] else "up to date"
+                rate = result["notes"] / result["seconds"] if result["seconds"] else 0
+                mb_rate = result["bytes"] / result["seconds"] / 1e6 if result["seconds"] else 0
+                print(f"{name}: {status}, {result['notes']} notes, {result['bytes']} bytes in "
+                      f"{result['seconds']:.2f}s ({rate:.0f} notes/s, {mb_rate:.1f} MB/s)")
+
+    elapsed = time.perf_counter() - start
+    cache = NoteCache.open_default()
+    try:
+        prune_note_cache(cache, index)
+    finally:
+        cache.close()
+    built = sum(1 for r in results if r["built"])
+    print("-" * 50)
+    print(f"{len(results)} bundles ({built} rebuilt) in {elapsed:.2f}s "
+          f"({len(results) / elapsed if elapsed else 0:.1f} bundles/s)")
+    return results
+
+def check_crawl_order(parent_file_path, search_folder, max_depth=3, workers=8):
+    """Crawl serially and in parallel with fresh caches and compare the results."""
+    initial_references = read_parent_file(parent_file_path)
+    index = load_note_index(search_folder)
+    serial = collect_all_references_recursive(
+        initial_references, search_folder, max_depth, index=index, cache=NoteCache()
+    )
+    parallel = collect_all_references_parallel(
+        initial_references, search_folder, max_depth, index=index, cache=NoteCache(), workers=workers
+    )
+    if serial == parallel:
+        print(f"OK: serial and parallel crawls match ({len(serial)} files)")
+        return True
+    print("ERROR: serial and parallel crawls differ")
+    return False
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concatenate a note and the notes it links to (recursively).")
+    parser.add_argument('parent_file', nargs='?', help='Note whose [[links]] start the bundle')
+    parser.add_argument('output_file', nargs='?', help='Combined markdown file to write')
+    parser.add_argument('search_folder', nargs='?', help='Vault folder to resolve links in')
+    parser.add_argument('--search-folder', dest='search_folder_option', metavar='FOLDER',
+                        help='Vault folder to resolve links in (same as the third positional argument)')
+    parser.add_argument('--depth', type=int, default=3, help='Max recursion depth (default: 3)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Threads used to read notes during the crawl (default: 1, serial)')
+    parser.add_argument('--compress', choices=['gzip', 'zstd'],
+                        help='Compress the output (default: by extension, .gz or .zst)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild even if the manifest says nothing changed')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and rebuild whenever a linked note changes')
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help='Polling interval in seconds for --watch (default: 5)')
+    parser.add_argument('--batch', metavar='JOBS_JSON',
+                        help='Build every (parent, output, depth) job in a JSON batch file')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for --batch (default: CPU count)')
+    parser.add_argument('--check-order', action='store_true',
+                        help='Verify the parallel crawl matches the serial one and exit')
+    args = parser.parse_args(argv)
+
+    if args.search_folder and args.search_folder_option:
+        parser.error("give the search folder either as an argument or with --search-folder, not both")
+    if args.batch and (args.parent_file or args.output_file or args.search_folder):
+        # The jobs come from the batch file; a stray positional would silently become parent_file
+        parser.error("--batch takes no positional arguments; use --search-folder for the vault")
+    args.search_folder = args.search_folder_option or args.search_folder or SEARCH_FOLDER
+    args.parent_file = args.parent_file or PARENT_FILE
+    args.output_file = args.output_file or OUTPUT_FILE
+    return args
+
 if __name__ == "__main__":
-    # Allow command line arguments for flexibility
-    if len(sys.argv) >= 2:
-        PARENT_FILE = sys.argv[1]
-    if len(sys.argv) >= 3:
-        OUTPUT_FILE = sys.argv[2]
-    if len(sys.argv) >= 4:
-        SEARCH_FOLDER = sys.argv[3]
+    args = parse_args()
+
+    if args.batch:
+        print("Dynamic Markdown Concatenator (Batch)")
+        print(f"Batch file: {args.batch}")
+        results = run_batch(args.batch, args.search_folder, args.depth, args.jobs, args.compress, args.force)
+        sys.exit(0 if results and not any(r["error"] for r in results) else 1)
 
     print("Dynamic Markdown Concatenator (Recursive)")
-    print(f"Search folder: {SEARCH_FOLDER}")
-    print(f"Parent file: {PARENT_FILE}")
-    print(f"Output file: {OUTPUT_FILE}")
-    print(f"Max recursion depth: 3")
+    print(f"Search folder: {args.search_folder}")
+    print(f"Parent file: {args.parent_file}")
+    print(f"Output file: {args.output_file}")
+    print(f"Max recursion depth: {args.depth}")
+    print(f"Workers: {args.workers}")
     print("-" * 50)
 
-    concatenate_notes(PARENT_FILE, SEARCH_FOLDER, OUTPUT_FILE, max_depth=3)
+    if not os.path.isdir(args.search_folder):
+        print(f"ERROR: Search folder not found: {args.search_folder}")
+        sys.exit(1)
+
+    if args.check_order:
+        ok = check_crawl_order(args.parent_file, args.search_folder, args.depth, max(args.workers, 2))
+        sys.exit(0 if ok else 1)
+
+    if args.watch:
+        watch_notes(args.parent_file, args.search_folder, args.output_file, args.depth,
+                    interval=args.interval, workers=args.workers, compression=args.compress)
+    else:
+        concatenate_notes(args.parent_file, args.search_folder, args.output_file, max_depth=args.depth,
+                          workers=args.workers, compression=args.compress, force=args.force)
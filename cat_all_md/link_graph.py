@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Link graph of a notes vault.
+
+Stores the resolved [[links]] of every note as forward and reverse
+adjacency arrays, kept up to date incrementally: only notes whose
+(mtime, size) changed are parsed again, and links are re-resolved only when
+the vault layout changed. Answers closure and impact queries without
+re-crawling the vault.
+
+Usage:
+    python link_graph.py SEARCH_FOLDER --closure "Parent.md" --depth 3
+    python link_graph.py SEARCH_FOLDER --includes "Some Note" --batch jobs.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from array import array
+
+from note_cache import NoteCache
+from note_index import DEFAULT_CACHE_DIR, NoteIndex
+
+GRAPH_VERSION = 2
+
+
+def default_graph_path(search_path, cache_dir=DEFAULT_CACHE_DIR):
+    key = hashlib.sha1(os.path.abspath(search_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"graph-{key}.json")
+
+
+class LinkGraph:
+    def __init__(self, graph_path=None):
+        self.graph_path = graph_path
+        self.paths = []          # node id -> note path
+        self.ids = {}            # note path -> node id
+        self.keys = []           # node id -> [mtime_ns, size] the refs were read at
+        self.refs = []           # node id -> raw [[reference]] names
+        self.forward = []        # node id -> array of target ids
+        self.reverse = []        # node id -> array of source ids
+        self.fingerprint = None
+
+    @classmethod
+    def load(cls, index, cache, graph_path=None):
+        """Load the stored graph for index.search_path and bring it up to date."""
+        if graph_path is None:
+            graph_path = default_graph_path(index.search_path)
+        graph = cls(graph_path)
+        try:
+            with open(graph_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == GRAPH_VERSION:
+                for path, key, refs, _ in data["notes"]:
+                    graph._add_node(path, key, refs)
+                # Saved node ids are positions in "notes", so edges can be restored as is
+                for node, (_, _, _, targets) in enumerate(data["notes"]):
+                    graph._set_edges(node, targets)
+                graph.fingerprint = data.get("fingerprint")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"WARNING: Ignoring unreadable link graph {graph_path}: {e}")
+        graph.update(index, cache)
+        return graph
+
+    def save(self):
+        if not self.graph_path:
+            return
+        # Renumber live nodes densely; removed notes leave gaps in the ids
+        saved_ids = {}
+        for node, path in enumerate(self.paths):
+            if path is not None:
+                saved_ids[node] = len(saved_ids)
+        notes = [[self.paths[node], self.keys[node], self.refs[node],
+                  [saved_ids[target] for target in self.forward[node] if target in saved_ids]]
+                 for node in saved_ids]
+        try:
+            os.makedirs(os.path.dirname(self.graph_path), exist_ok=True)
+            tmp_path = self.graph_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": GRAPH_VERSION, "fingerprint": self.fingerprint, "notes": notes}, f)
+            os.replace(tmp_path, self.graph_path)
+        except Exception as e:
+            print(f"WARNING: Could not save link graph {self.graph_path}: {e}")
+
+    def _add_node(self, path, key=None, refs=None):
+        node = self.ids.get(path)
+        if node is not None:
+            return node
+        node = len(self.paths)
+        self.ids[path] = node
+        self.paths.append(path)
+        self.keys.append(key)
+        self.refs.append(refs or [])
+        self.forward.append(array('i'))
+        self.reverse.append(array('i'))
+        return node
+
+    def _set_edges(self, node, targets):
+        for target in self.forward[node]:
+            self.reverse[target].remove(node)
+        self.forward[node] = array('i', targets)
+        for target in targets:
+            self.reverse[target].append(node)
+
+    def _resolve(self, node, index):
+        targets = []
+        seen = set()
+        for name in self.refs[node]:
+            path = index.find(name)
+            if path is None:
+                continue
+            target = self._add_node(path)
+            if target not in seen:
+                seen.add(target)
+                targets.append(target)
+        self._set_edges(node, targets)
+
+    def update(self, index, cache):
+        """
+        Re-read notes whose (mtime, size) changed and drop deleted ones. Links
+        of every note are re-resolved only if the vault layout changed.
+        Returns the paths of notes whose links were re-read.
+        """
+        relink_all = self.fingerprint != index.fingerprint()
+        changed = []
+
+        current = set(index.note_paths())
+        for path in list(self.ids):
+            if path not in current and not os.path.exists(path):
+                self._remove_node(path)
+
+        for path in current:
+            node = self._add_node(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = [st.st_mtime_ns, st.st_size]
+            if self.keys[node] == key:
+                continue
+            try:
+                self.refs[node] = cache.get_references(path)
+            except Exception as e:
+                print(f"ERROR reading file {path}: {e}")
+                self.refs[node] = []
+            self.keys[node] = key
+            changed.append(path)
+            if not relink_all:
+                self._resolve(node, index)
+
+        if relink_all:
+            for node, path in enumerate(self.paths):
+                if path is not None:
+                    self._resolve(node, index)
+            self.fingerprint = index.fingerprint()
+        return changed
+
+    def _remove_node(self, path):
+        node = self.ids.pop(path)
+        self._set_edges(node, [])
+        # Keep ids stable; links pointing here are dropped until the note reappears
+        for source in list(self.reverse[node]):
+            self.forward[source].remove(node)
+        self.reverse[node] = array('i')
+        self.paths[node] = None
+        self.keys[node] = None
+        self.refs[node] = []
+
+    def _bfs(self, start, max_depth, edges):
+        """Return {node id: distance} for nodes within max_depth hops of start (start only if on a cycle)."""
+        distances = {}
+        frontier = [start]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for node in frontier:
+                for neighbour in edges[node]:
+                    if neighbour not in distances:
+                        distances[neighbour] = depth
+                        next_frontier.append(neighbour)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return distances
+
+    def reachable_by_depth(self, parent_path, max_depth=3):
+        """Return one list of note paths per depth level linked from parent_path."""
+        levels = [[] for _ in range(max_depth)]
+        node = self.ids.get(parent_path)
+        if node is None:
+            return levels
+        for target, depth in self._bfs(node, max_depth, self.forward).items():
+            levels[depth - 1].append(self.paths[target])
+        return levels
+
+    def closure(self, parent_path, max_depth=3):
+        """All notes within max_depth links of parent_path."""
+        return [path for level in self.reachable_by_depth(parent_path, max_depth) for path in level]
+
+    def bundles_including(self, note_path, bundles):
+        """
+        Return the bundles (dicts with "parent" and "depth") whose link
+        closure contains note_path. This is a superset of the notes the
+        depth-first crawl actually writes, so it is safe for deciding what
+        to rebuild.
+        """
+        node = self.ids.get(note_path)
+        if node is None or not bundles:
+            return []
+        max_depth = max(b["depth"] for b in bundles)
+        ancestors = self._bfs(node, max_depth, self.reverse)
+        affected = []
+        for bundle in bundles:
+            parent = self.ids.get(bundle["parent"])
+            if parent is None:
+                continue
+            if parent in ancestors and ancestors[parent] <= bundle["depth"]:
+                affected.append(bundle)
+        return affected
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def resolve_note_path(name_or_path, index):
+    if os.path.exists(name_or_path):
+        return os.path.abspath(name_or_path)
+    if name_or_path.endswith(".md"):
+        name_or_path = name_or_path[:-3]
+    return index.find(name_or_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the [[link]] graph of a notes vault.")
+    parser.add_argument('search_folder', help='Vault folder')
+    parser.add_argument('--closure', metavar='PARENT', help='List notes linked from PARENT up to --depth')
+    parser.add_argument('--depth', type=int, default=3, help='Max link depth (default: 3)')
+    parser.add_argument('--includes', metavar='NOTE', help='List bundles whose closure contains NOTE')
+    parser.add_argument('--batch', metavar='JOBS_JSON', help='Batch file listing the bundles (for --includes)')
+    args = parser.parse_args()
+    args.search_folder = os.path.abspath(args.search_folder)
+
+    start = time.perf_counter()
+    index = NoteIndex.load(args.search_folder)
+    index.save()
+    cache = NoteCache.open_default()
+    graph = LinkGraph.load(index, cache)
+    graph.save()
+    cache.close()
+    print(f"Graph ready: {len(graph)} notes in {time.perf_counter() - start:.2f}s")
+
+    if args.closure:
+        parent = resolve_note_path(args.closure, index)
+        if parent is None:
+            print(f"ERROR: Note not found: {args.closure}")
+            sys.exit(1)
+        start = time.perf_counter()
+        levels = graph.reachable_by_depth(parent, args.depth)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for depth, level in enumerate(levels, 1):
+            for path in level:
+                print(f"Level {depth}: {path}")
+        print(f"{sum(len(level) for level in levels)} notes reachable ({elapsed_ms:.2f} ms)")
+
+    if args.includes:
+        if not args.batch:
+            print("ERROR: --includes needs --batch to know which bundles exist")
+            sys.exit(1)
+        from cat_all_md import load_batch_jobs
+        note = resolve_note_path(args.includes, index)
+        if note is None:
+            print(f"ERROR: Note not found: {args.includes}")
+            sys.exit(1)
+        _, jobs = load_batch_jobs(args.batch, args.search_folder, args.depth)
+        for job in jobs:
+            job["parent"] = os.path.abspath(job["parent"])
+        start = time.perf_counter()
+        affected = graph.bundles_including(note, jobs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for job in affected:
+            print(f"Included by: {job['output']}")
+        print(f"{len(affected)} of {len(jobs)} bundles affected ({elapsed_ms:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Read-once cache of parsed notes.
+
+Each note is read once and kept as its body (metadata header skipped,
+trailing blank lines removed) plus the [[references]] found in it. Entries
+live in an in-memory LRU bounded by body size, backed by a sqlite file keyed
+by (mtime, size) so later runs skip notes that have not changed. The file is
+shared by concurrent runs, so it uses WAL and commits every row on its own.
+
+Notes larger than max_entry_bytes are never held in memory: their references
+are scanned in chunks and their body is left for the writer to stream.
+
+Rows are keyed by path, so an edited note replaces its row; rows of notes
+that were deleted or renamed are dropped by prune() after a build.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from note_index import DEFAULT_CACHE_DIR
+
+HEADER_LINES = 10
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRY_BYTES = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+REFERENCE_PATTERN = re.compile(r'\[\[([^\]]+)\]\]')
+
+
+def parse_note_lines(lines):
+    """Return (body, references) for the lines of a note file."""
+    # Skip the first 10 lines (metadata)
+    if len(lines) > HEADER_LINES:
+        content_lines = lines[HEADER_LINES:]
+    else:
+        content_lines = []
+
+    # Remove trailing empty lines
+    while content_lines and content_lines[-1].strip() == '':
+        content_lines.pop()
+
+    body = ''.join(content_lines)
+    return body, REFERENCE_PATTERN.findall(body)
+
+
+def skip_header(file, chunk_size=CHUNK_SIZE):
+    """Advance an open note past its metadata header without reading whole lines at once."""
+    lines_skipped = 0
+    while lines_skipped < HEADER_LINES:
+        piece = file.readline(chunk_size)
+        if not piece:
+            return
+        if piece.endswith('\n'):
+            lines_skipped += 1
+
+
+def iter_body_chunks(file, chunk_size=CHUNK_SIZE):
+    """Yield the text after the header of an open note in fixed-size chunks."""
+    skip_header(file, chunk_size)
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def scan_references(chunks):
+    """Find [[references]] in a stream of text chunks, keeping only an unfinished link in memory."""
+    references = []
+    buf = ''
+    for chunk in chunks:
+        buf += chunk
+        last = 0
+        for match in REFERENCE_PATTERN.finditer(buf):
+            references.append(match.group(1))
+            last = match.end()
+        # Keep from the first "[[" that could still complete in the next chunk
+        closing = buf.rfind(']', last, len(buf) - 1)
+        start = buf.find('[[', max(last, closing + 1))
+        if start == -1:
+            start = max(last, len(buf) - 1)
+        buf = buf[start:]
+    return references
+
+
+class NoteCache:
+    def __init__(self, db_path=None, max_bytes=DEFAULT_MAX_BYTES, max_entry_bytes=DEFAULT_MAX_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.memory = OrderedDict()  # path -> (mtime_ns, size, body, references)
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = None
+        if db_path is not None:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+                # Autocommit: every row is its own short write, so batch workers
+                # sharing this file never wait on a transaction held for a whole job
+                self.db = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+                self.db.execute("PRAGMA journal_mode=WAL")
+                self.db.execute("PRAGMA synchronous=NORMAL")
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS notes ("
+                    "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+                    "body TEXT, refs TEXT)"
+                )
+            except sqlite3.Error as e:
+                print(f"WARNING: Note cache disabled on disk ({db_path}): {e}")
+                self.db = None
+
+    @classmethod
+    def open_default(cls, max_bytes=DEFAULT_MAX_BYTES):
+        return cls(os.path.join(DEFAULT_CACHE_DIR, "notes.sqlite3"), max_bytes)
+
+    def get(self, file_path):
+        """
+        Return (body, references) for a note, reading it only if it changed
+        since it was cached. body is None for notes over max_entry_bytes.
+        Read errors are raised to the caller.
+        """
+        st = os.stat(file_path)
+        key = (st.st_mtime_ns, st.st_size)
+
+        with self.lock:
+            entry = self.memory.get(file_path)
+            if entry is not None and entry[:2] == key:
+                self.memory.move_to_end(file_path)
+                self.hits += 1
+                return entry[2], entry[3]
+            row = self._load_row(file_path, key)
+            if row is not None:
+                self.hits += 1
+                self._remember(file_path, key, *row)
+                return row
+
+        with open(file_path, 'r', encoding='utf-8') as file:
+            st = os.fstat(file.fileno())
+            key = (st.st_mtime_ns, st.st_size)
+            if st.st_size > self.max_entry_bytes:
+                body, references = None, scan_references(iter_body_chunks(file))
+            else:
+                body, references = parse_note_lines(file.readlines())
+
+        with self.lock:
+            self.misses += 1
+            self._remember(file_path, key, body, references)
+            self._store_row(file_path, key, body, references)
+        return body, references
+
+    def get_references(self, file_path):
+        return self.get(file_path)[1]
+
+    def get_body(self, file_path):
+        return self.get(file_path)[0]
+
+    def _remember(self, file_path, key, body, references):
+        old = self.memory.pop(file_path, None)
+        if old is not None:
+            self.memory_bytes -= self._entry_size(old)
+        entry = (key[0], key[1], body, references)
+        if self._entry_size(entry) > self.max_bytes:
+            return
+        self.memory[file_path] = entry
+        self.memory_bytes += self._entry_size(entry)
+        # Evict least recently used notes until we are back under the limit
+        while self.memory_bytes > self.max_bytes and self.memory:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= self._entry_size(evicted)
+
+    @staticmethod
+    def _entry_size(entry):
+        return len(entry[2]) if entry[2] is not None else 0
+
+    def _load_row(self, file_path, key):
+        if self.db is None:
+            return None
+        try:
+            row = self.db.execute(
+                "SELECT body, refs FROM notes WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (file_path, key[0], key[1]),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _store_row(self, file_path, key, body, references):
+        if self.db is None:
+            return
+        try:
+            self.db.execute(
+                "INSERT OR REPLACE INTO notes (path, mtime_ns, size, body, refs) VALUES (?, ?, ?, ?, ?)",
+                (file_path, key[0], key[1], body, json.dumps(references)),
+            )
+        except sqlite3.Error as e:
+            print(f"WARNING: Could not cache {file_path}: {e}")
+
+    def prune(self, index):
+        """
+        Delete rows for notes under index.search_path that are no longer in
+        the index (deleted or renamed). Rows of other vaults sharing the file
+        are left alone. Returns the number of rows removed.
+        """
+        if self.db is None:
+            return 0
+        prefix = os.path.join(index.search_path, "")
+        live = set(index.note_paths())
+        with self.lock:
+            try:
+                rows = self.db.execute(
+                    "SELECT path FROM notes WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+                ).fetchall()
+                stale = [(path,) for path, in rows if path not in live]
+                if stale:
+                    self.db.execute("BEGIN")
+                    self.db.executemany("DELETE FROM notes WHERE path = ?", stale)
+                    self.db.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self.db.in_transaction:
+                    self.db.execute("ROLLBACK")
+                print(f"WARNING: Could not prune note cache: {e}")
+                return 0
+            for path, in stale:
+                old = self.memory.pop(path, None)
+                if old is not None:
+                    self.memory_bytes -= self._entry_size(old)
+        return len(stale)
+
+    def flush(self):
+        # Rows are committed as they are stored; kept for callers that flush explicitly
+        if self.db is not None:
+            with self.lock:
+                try:
+                    self.db.commit()
+                except sqlite3.Error as e:
+                    print(f"WARNING: Could not save note cache: {e}")
+
+    def close(self):
+        self.flush()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,163 @@
+"""
+Persistent index of the markdown notes in a vault.
+
+Maps exact and lower-cased note names to file paths so link resolution is a
+dictionary lookup instead of an os.walk per [[reference]]. The directory
+listing is cached on disk and refreshed using directory mtimes: a directory
+whose mtime has not changed is not listed again.
+"""
+
+import hashlib
+import json
+import os
+
+INDEX_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cat_all_md")
+
+
+def default_index_path(search_path, cache_dir=DEFAULT_CACHE_DIR):
+    """Return the on-disk index location for a search folder."""
+    key = hashlib.sha1(os.path.abspath(search_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"index-{key}.json")
+
+
+class NoteIndex:
+    def __init__(self, search_path, index_path=None):
+        self.search_path = search_path
+        self.index_path = index_path
+        # dir path -> [mtime_ns, subdirs, md files], in os.walk order
+        self.dirs = {}
+        self.exact = {}
+        self.lower = {}
+        self.changed = False
+
+    @classmethod
+    def load(cls, search_path, index_path=None):
+        """Load the index for search_path from disk and bring it up to date."""
+        if index_path is None:
+            index_path = default_index_path(search_path)
+        index = cls(search_path, index_path)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("root") == os.path.abspath(search_path):
+                index.dirs = data["dirs"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"WARNING: Ignoring unreadable note index {index_path}: {e}")
+        index.refresh()
+        return index
+
+    def save(self):
+        if not self.index_path or not self.changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION,
+                           "root": os.path.abspath(self.search_path),
+                           "dirs": self.dirs}, f)
+            os.replace(tmp_path, self.index_path)
+            self.changed = False
+        except Exception as e:
+            print(f"WARNING: Could not save note index {self.index_path}: {e}")
+
+    def refresh(self):
+        """
+        Re-walk the vault, listing only directories whose mtime changed.
+        Returns True if any directory was added, removed or modified.
+        """
+        old_dirs = self.dirs
+        new_dirs = {}
+        changed = False
+        stack = [self.search_path]
+        while stack:
+            dir_path = stack.pop()
+            try:
+                mtime = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                continue
+            cached = old_dirs.get(dir_path)
+            if cached is not None and cached[0] == mtime:
+                entry = cached
+            else:
+                changed = True
+                entry = self._list_dir(dir_path, mtime)
+                if entry is None:
+                    continue
+            new_dirs[dir_path] = entry
+            # Reverse so subdirectories are visited in listing order (like os.walk)
+            for name in reversed(entry[1]):
+                stack.append(os.path.join(dir_path, name))
+
+        if len(new_dirs) != len(old_dirs):
+            changed = True
+        self.dirs = new_dirs
+        self.changed = self.changed or changed
+        self._build_lookup()
+        return changed
+
+    @staticmethod
+    def _list_dir(dir_path, mtime):
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            # os.walk does not descend into symlinked directories
+                            if not entry.is_symlink():
+                                subdirs.append(entry.name)
+                        elif entry.name.lower().endswith(".md"):
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return [mtime, subdirs, files]
+
+    def _build_lookup(self):
+        exact = {}
+        lower = {}
+        for dir_path, (_, _, files) in self.dirs.items():
+            for file in files:
+                path = os.path.join(dir_path, file)
+                name = file[:-3]
+                if file.endswith(".md"):
+                    exact.setdefault(name, path)
+                lower.setdefault(name.lower(), path)
+        self.exact = exact
+        self.lower = lower
+
+    def note_paths(self):
+        """Yield the path of every indexed note, including ones shadowed by an earlier match."""
+        for dir_path, (_, _, files) in self.dirs.items():
+            for file in files:
+                yield os.path.join(dir_path, file)
+
+    def fingerprint(self):
+        """Hash of every indexed directory and its mtime; changes when any note is added, removed or renamed."""
+        digest = hashlib.sha1()
+        for dir_path, (mtime, _, _) in self.dirs.items():
+            digest.update(f"{dir_path}\0{mtime}\0".encode('utf-8', 'surrogateescape'))
+        return digest.hexdigest()
+
+    def find(self, note_name):
+        """
+        Resolve a note name the same way find_markdown_file does: the first
+        directory (in walk order) holding a case-insensitive match wins, and
+        within that directory an exact match is preferred.
+        """
+        path = self.lower.get(note_name.lower())
+        if path is None:
+            return None
+        exact_path = self.exact.get(note_name)
+        if exact_path is not None and os.path.dirname(exact_path) == os.path.dirname(path):
+            return exact_path
+        return path
+
+    def __len__(self):
+        return len(self.exact)
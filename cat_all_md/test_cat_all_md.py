@@ -0,0 +1,136 @@
+"""Bundles built into the vault they are made from, and the parallel crawl order."""
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from cat_all_md import collect_all_references_parallel, collect_all_references_recursive, concatenate_notes
+from note_cache import HEADER_LINES, NoteCache
+from note_index import NoteIndex
+
+
+def write_note(folder, name, body):
+    path = os.path.join(folder, name + ".md")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("meta\n" * HEADER_LINES + body)
+    return path
+
+
+class BundleInVaultTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="cat_all_md_test_")
+        self.vault = os.path.join(self.folder, "vault")
+        os.makedirs(os.path.join(self.vault, "sub"))
+        self.parent = write_note(self.vault, "Parent", "[[A]] [[B]] [[Missing]]\n")
+        write_note(self.vault, "A", "a body [[C]]\n")
+        write_note(os.path.join(self.vault, "sub"), "B", "b body\n")
+        write_note(self.vault, "C", "c body\n")
+        self.output = os.path.join(self.vault, "Combined.md")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def build(self, output=None):
+        """One run of the tool: a freshly loaded index and cache, like a new process."""
+        index = NoteIndex.load(self.vault, os.path.join(self.folder, "index.json"))
+        index.save()
+        cache = NoteCache(os.path.join(self.folder, "notes.sqlite3"))
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log):
+                built = concatenate_notes(self.parent, self.vault, output or self.output,
+                                          index=index, cache=cache)
+        finally:
+            cache.close()
+        return built, log.getvalue()
+
+    def test_second_build_into_vault_is_skipped(self):
+        built, _ = self.build()
+        self.assertTrue(built)
+        built, log = self.build()
+        self.assertFalse(built)
+        self.assertIn("Up to date", log)
+
+    def test_bundles_in_same_vault_do_not_invalidate_each_other(self):
+        other = os.path.join(self.vault, "Other.md")
+        self.assertTrue(self.build()[0])
+        self.assertTrue(self.build(other)[0])
+        self.assertFalse(self.build()[0])
+        self.assertFalse(self.build(other)[0])
+
+    def test_new_note_for_missing_link_triggers_rebuild(self):
+        self.build()
+        write_note(os.path.join(self.vault, "sub"), "missing", "now here\n")
+        built, _ = self.build()
+        self.assertTrue(built)
+        with open(self.output, 'r', encoding='utf-8') as f:
+            self.assertIn("now here", f.read())
+
+    def test_unrelated_note_does_not_trigger_rebuild(self):
+        self.build()
+        write_note(self.vault, "Unrelated", "nothing links here\n")
+        self.assertFalse(self.build()[0])
+
+
+class CrawlOrderTest(unittest.TestCase):
+    def setUp(self):
+        self.vault = tempfile.mkdtemp(prefix="cat_all_md_crawl_")
+
+    def tearDown(self):
+        shutil.rmtree(self.vault, ignore_errors=True)
+
+    def make_vault(self, seed, notes=60):
+        """Random links between notes in nested folders, with cycles, case collisions and missing targets."""
+        rng = random.Random(seed)
+        folders = ["", "a", os.path.join("a", "b"), "c"]
+        for folder in folders:
+            os.makedirs(os.path.join(self.vault, folder), exist_ok=True)
+        names = [f"Note {i}" for i in range(notes)]
+        link_names = names + [name.upper() for name in names[:10]] + [f"Missing {i}" for i in range(5)]
+        for i, name in enumerate(names):
+            links = [rng.choice(link_names) for _ in range(rng.randint(0, 6))]
+            # Every note links back to the one before it, so the graph is full of cycles
+            links.append(names[i - 1])
+            write_note(os.path.join(self.vault, rng.choice(folders)), name,
+                       " ".join(f"[[{link}]]" for link in links) + "\n")
+        # Same name, different case, in other folders: resolution depends on walk order
+        for i in range(0, notes, 7):
+            write_note(os.path.join(self.vault, rng.choice(folders)), names[i].lower(),
+                       f"[[{rng.choice(link_names)}]]\n")
+        return [rng.choice(link_names) for _ in range(5)]
+
+    def crawl(self, initial, max_depth, parallel):
+        index = NoteIndex(self.vault)
+        index.refresh()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if parallel:
+                return collect_all_references_parallel(initial, self.vault, max_depth, index=index,
+                                                       cache=NoteCache(), workers=4)
+            return collect_all_references_recursive(initial, self.vault, max_depth, index=index, cache=NoteCache())
+
+    def test_parallel_crawl_matches_serial_order(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                shutil.rmtree(self.vault)
+                initial = self.make_vault(seed)
+                for max_depth in (1, 3, 6):
+                    serial = self.crawl(initial, max_depth, parallel=False)
+                    self.assertTrue(serial)
+                    self.assertEqual(self.crawl(initial, max_depth, parallel=True), serial)
+
+    def test_index_lookup_matches_directory_walk(self):
+        initial = self.make_vault(0)
+        index = NoteIndex(self.vault)
+        index.refresh()
+        with contextlib.redirect_stdout(io.StringIO()):
+            walked = collect_all_references_recursive(initial, self.vault, 6)
+            indexed = collect_all_references_recursive(initial, self.vault, 6, index=index, cache=NoteCache())
+        self.assertEqual(indexed, walked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Concurrent writers sharing one note cache file, and pruning rows of deleted notes."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from note_cache import HEADER_LINES, NoteCache
+from note_index import NoteIndex
+
+
+def write_notes(folder, prefix, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"{prefix}_{i}.md")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("meta\n" * HEADER_LINES + f"body {i} [[{prefix}_{i + 1}]]\n")
+        paths.append(path)
+    return paths
+
+
+class ConcurrentWritersTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="note_cache_test_")
+        self.db_path = os.path.join(self.folder, "notes.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_unflushed_writer_does_not_block_another(self):
+        first = NoteCache(self.db_path)
+        second = NoteCache(self.db_path)
+        a, = write_notes(self.folder, "a", 1)
+        b, = write_notes(self.folder, "b", 1)
+
+        first.get(a)  # stored, but first is never flushed before second writes
+        start = time.perf_counter()
+        second.get(b)
+        second.close()
+        self.assertLess(time.perf_counter() - start, 5)
+        first.close()
+
+        with sqlite3.connect(self.db_path) as db:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM notes").fetchone()[0], 2)
+
+    def test_two_writers_at_once_keep_all_entries(self):
+        notes = {prefix: write_notes(self.folder, prefix, 200) for prefix in ("x", "y")}
+        errors = []
+
+        def run(paths):
+            cache = NoteCache(self.db_path)
+            try:
+                for path in paths:
+                    cache.get(path)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                cache.close()
+
+        threads = [threading.Thread(target=run, args=(paths,)) for paths in notes.values()]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLess(time.perf_counter() - start, 20)
+
+        reader = NoteCache(self.db_path)
+        for paths in notes.values():
+            for path in paths:
+                self.assertIsNotNone(reader._load_row(path, (os.stat(path).st_mtime_ns, os.stat(path).st_size)))
+        reader.close()
+
+
+class PruneTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="note_cache_test_")
+        self.db_path = os.path.join(self.folder, "notes.sqlite3")
+        self.vault = os.path.join(self.folder, "vault")
+        self.other = os.path.join(self.folder, "vault2")
+        os.makedirs(self.vault)
+        os.makedirs(self.other)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def cached_paths(self):
+        with sqlite3.connect(self.db_path) as db:
+            return {path for path, in db.execute("SELECT path FROM notes")}
+
+    def test_prune_drops_deleted_and_renamed_notes_only(self):
+        kept, deleted, renamed = write_notes(self.vault, "n", 3)
+        other, = write_notes(self.other, "o", 1)
+        cache = NoteCache(self.db_path)
+        for path in (kept, deleted, renamed, other):
+            cache.get(path)
+
+        os.remove(deleted)
+        new_name = os.path.join(self.vault, "renamed.md")
+        os.rename(renamed, new_name)
+        cache.get(new_name)
+        index = NoteIndex(self.vault)
+        index.refresh()
+
+        self.assertEqual(cache.prune(index), 2)
+        self.assertEqual(self.cached_paths(), {kept, new_name, other})
+        self.assertEqual(cache.prune(index), 0)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,16 +7,31 @@ Usage (CLI):
 
 If output_dir is omitted it writes files next to input PDF.
 
+Ranges can also be planned automatically (see split_planner.py):
+    python split_pdf_ranges.py input.pdf --max-size 20MB /path/to/output_dir
+    python split_pdf_ranges.py input.pdf --by-outline [--max-size 20MB]
+
+Many ranges are written in parallel: each worker process parses the input
+once and writes a run of neighbouring parts, so objects shared between
+those parts (fonts, images) are parsed only once per worker. Use
+--workers 1 for the serial loop.
+
 Interactive mode:
     Run without args and follow prompts.
 """
 
 import os
+import io
 import sys
 import argparse
-from typing import List, Tuple
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 import PyPDF2
 
+from pdf_page_index import close_pdf, open_pdf
+from split_planner import parse_size, plan_by_outline, plan_by_size
+
 def parse_ranges(ranges_str: str) -> List[Tuple[int, int]]:
     """
     Parse a ranges string like "1:3 3:9 9:11" or "1-3,3-9,9-11" into list of (start,end).
@@ -83,28 +98,90 @@ def extract_range(reader: PyPDF2.PdfReader, start: int, end: int, output_path: s
         print(f"Unexpected error extracting {start}-{end}: {exc}")
         return False
 
-def split_pdf_by_ranges(input_pdf_path: str, ranges: List[Tuple[int,int]], output_dir: str = None) -> None:
+def part_output_paths(input_pdf_path: str, ranges: List[Tuple[int,int]], output_dir: str) -> List[str]:
+    base_name = os.path.splitext(os.path.basename(input_pdf_path))[0]
+    return [
+        os.path.join(output_dir, f"{base_name}_part{idx}_{start}-{end}.pdf")
+        for idx, (start, end) in enumerate(ranges, start=1)
+    ]
+
+def group_parts(parts: list, workers: int) -> List[list]:
+    """
+    Split the parts into runs of neighbouring page ranges, a few per worker,
+    so each worker's parsed objects are reused by the parts it writes.
+    """
+    ordered = sorted(parts, key=lambda part: (part[1], part[2]))
+    group_count = min(len(ordered), workers * 4)
+    size, extra = divmod(len(ordered), group_count)
+    groups = []
+    begin = 0
+    for i in range(group_count):
+        end = begin + size + (1 if i < extra else 0)
+        groups.append(ordered[begin:end])
+        begin = end
+    return groups
+
+# Each worker parses the whole input, so it needs enough parts to pay that back
+MIN_PARTS_PER_WORKER = 8
+
+_worker_reader = None
+
+def _init_split_worker(input_pdf_path: str) -> None:
+    global _worker_reader
+    # Opened once per worker through the page index; the reader caches every object it resolves
+    _worker_reader = open_pdf(input_pdf_path)
+
+def _extract_group(group: list) -> List[Tuple[int, str]]:
+    results = []
+    for idx, start, end, out_path in group:
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            extract_range(_worker_reader, start, end, out_path)
+        results.append((idx, log.getvalue()))
+    return results
+
+def split_pdf_by_ranges(input_pdf_path: str, ranges: List[Tuple[int,int]], output_dir: str = None,
+                        workers: Optional[int] = None) -> None:
+    """
+    Write one PDF per range. With more than one worker (default: CPU count)
+    the parts are written by a process pool; workers=1 keeps the serial loop.
+    """
     if not os.path.exists(input_pdf_path):
         print(f"Error: input file does not exist: {input_pdf_path}")
         return
 
-    base_name = os.path.splitext(os.path.basename(input_pdf_path))[0]
     if output_dir is None or output_dir.strip() == "":
         output_dir = os.path.dirname(input_pdf_path)
     if not output_dir:
         output_dir = os.getcwd()
     os.makedirs(output_dir, exist_ok=True)
+    out_paths = part_output_paths(input_pdf_path, ranges, output_dir)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(ranges) // MIN_PARTS_PER_WORKER))
 
+    reader = None
     try:
-        with open(input_pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            total_pages = len(reader.pages)
-            print(f"Input PDF: {input_pdf_path}  (total pages: {total_pages})")
-
-            for idx, (start, end) in enumerate(ranges, start=1):
-                out_name = f"{base_name}_part{idx}_{start}-{end}.pdf"
-                out_path = os.path.join(output_dir, out_name)
+        # Only the pages being extracted are parsed, using the file's page index
+        reader = open_pdf(input_pdf_path)
+        total_pages = len(reader.pages)
+        print(f"Input PDF: {input_pdf_path}  (total pages: {total_pages})")
+
+        if workers == 1:
+            for (start, end), out_path in zip(ranges, out_paths):
                 extract_range(reader, start, end, out_path)
+            return
+
+        parts = [(idx, start, end, out_path)
+                 for idx, ((start, end), out_path) in enumerate(zip(ranges, out_paths), start=1)]
+        groups = group_parts(parts, workers)
+        logs = {}
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups)), initializer=_init_split_worker,
+                                 initargs=(input_pdf_path,)) as pool:
+            for results in pool.map(_extract_group, groups):
+                for idx, log in results:
+                    logs[idx] = log
+        # Report in range order, as the serial loop does
+        for idx in sorted(logs):
+            print(logs[idx], end="")
 
     except PyPDF2.errors.DependencyError as e:
         print("Dependency Error:", e)
@@ -113,13 +190,41 @@ def split_pdf_by_ranges(input_pdf_path: str, ranges: List[Tuple[int,int]], outpu
         print("PDF Read Error:", e)
     except Exception as e:
         print("An unexpected error occurred:", e)
+    finally:
+        if reader is not None:
+            close_pdf(reader)
 
 def main():
     parser = argparse.ArgumentParser(description="Extract multiple sub-PDFs from a single PDF by ranges.")
     parser.add_argument('input_pdf', nargs='?', help='Path to input PDF')
     parser.add_argument('ranges', nargs='?', help='Ranges string e.g. "1:3 3:9 9:11" (quotes recommended)')
     parser.add_argument('output_dir', nargs='?', help='Output directory (optional)')
-    args = parser.parse_args()
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes writing the parts (default: CPU count, 1 = serial)')
+    parser.add_argument('--max-size', help='Plan ranges automatically so each part stays under this size (e.g. 20MB)')
+    parser.add_argument('--by-outline', action='store_true',
+                        help='Plan ranges automatically, one part per top-level outline entry (chapter)')
+    args = parser.parse_intermixed_args()
+
+    if args.input_pdf and (args.max_size or args.by_outline):
+        # No ranges are given in this mode, so the second positional is the output directory
+        output_dir = args.output_dir or args.ranges
+        try:
+            max_bytes = parse_size(args.max_size) if args.max_size else None
+        except ValueError as e:
+            print(f"Error parsing size: {e}")
+            return
+        try:
+            if args.by_outline:
+                ranges = plan_by_outline(args.input_pdf, max_bytes)
+            else:
+                ranges = plan_by_size(args.input_pdf, max_bytes)
+        except Exception as e:
+            print(f"Error planning split: {e}")
+            return
+        print(f"Planned {len(ranges)} parts: {' '.join(f'{s}:{e}' for s, e in ranges)}")
+        split_pdf_by_ranges(args.input_pdf, ranges, output_dir, args.workers)
+        return
 
     if args.input_pdf and args.ranges:
         try:
@@ -127,7 +232,7 @@ def main():
         except ValueError as e:
             print(f"Error parsing ranges: {e}")
             return
-        split_pdf_by_ranges(args.input_pdf, ranges, args.output_dir)
+        split_pdf_by_ranges(args.input_pdf, ranges, args.output_dir, args.workers)
         return
 
     # Interactive fallback
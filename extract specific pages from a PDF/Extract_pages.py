@@ -1,9 +1,11 @@
 import PyPDF2
 
+from pdf_page_index import close_pdf, open_pdf
+
 def extract_pages(input_pdf_path, output_pdf_path, start_page, end_page):
-    # Open the input PDF file
-    with open(input_pdf_path, 'rb') as input_pdf:
-        reader = PyPDF2.PdfReader(input_pdf)
+    # Open the input PDF through its page index so only the requested pages are parsed
+    reader = open_pdf(input_pdf_path)
+    try:
         writer = PyPDF2.PdfWriter()
 
         # Iterate through the specified range of pages
@@ -11,14 +13,17 @@ def extract_pages(input_pdf_path, output_pdf_path, start_page, end_page):
             page = reader.pages[page_num]
             writer.add_page(page)
 
-        # Write the extracted pages to the output PDF file
+        # Write the extracted pages to the output PDF file (pages are read lazily from the input)
         with open(output_pdf_path, 'wb') as output_pdf:
             writer.write(output_pdf)
+    finally:
+        close_pdf(reader)
 
-input_pdf_path = '/home/codsalah/Downloads/dotss.pdf' 
-output_pdf_path = '/home/codsalah/Downloads/exdotss.pdf'  
-start_page = 1  # Start page (inclusive)
-end_page = 3  # End page (exclusive)
+if __name__ == "__main__":
+    input_pdf_path = '/home/codsalah/Downloads/dotss.pdf' 
+    output_pdf_path = '/home/codsalah/Downloads/exdotss.pdf'  
+    start_page = 1  # Start page (inclusive)
+    end_page = 3  # End page (exclusive)
 
-extract_pages(input_pdf_path, output_pdf_path, start_page, end_page)
-print(f"Pages {start_page} to {end_page} have been extracted to {output_pdf_path}")
\ No newline at end of file
+    extract_pages(input_pdf_path, output_pdf_path, start_page, end_page)
+    print(f"Pages {start_page} to {end_page} have been extracted to {output_pdf_path}")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for DynamicallyExtractPages.split_pdf_by_ranges.
+
+Generates a book whose pages share one font and one image, splits it into
+equal parts with the serial loop (--workers 1) and with the process pool,
+checks both produce the same page counts and reports the speedup.
+
+Usage:
+    python bench_split_pdf.py --pages 2000 --parts 200 --workers 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+import PyPDF2
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject, NumberObject
+
+from DynamicallyExtractPages import split_pdf_by_ranges
+
+
+def make_book(path, pages, image_bytes=200_000):
+    """Write a book whose pages all reference the same font and image resources."""
+    writer = PyPDF2.PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    image = DecodedStreamObject()
+    image.set_data(os.urandom(image_bytes))
+    image.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Image"),
+        NameObject("/Width"): NumberObject(image_bytes // 3 // 100),
+        NameObject("/Height"): NumberObject(100),
+        NameObject("/ColorSpace"): NameObject("/DeviceRGB"),
+        NameObject("/BitsPerComponent"): NumberObject(8),
+    })
+    image = writer._add_object(image)
+    for n in range(pages):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+            NameObject("/XObject"): DictionaryObject({NameObject("/Im1"): image}),
+        })
+        content = DecodedStreamObject()
+        content.set_data(f"q 100 0 0 100 72 600 cm /Im1 Do Q BT /F1 12 Tf 72 720 Td (Page {n + 1}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+
+def page_counts(directory):
+    counts = {}
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), 'rb') as f:
+            counts[name] = len(PyPDF2.PdfReader(f).pages)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs parallel multi-range splitting.")
+    parser.add_argument('--pages', type=int, default=2000, help='Pages in the generated book (default: 2000)')
+    parser.add_argument('--parts', type=int, default=200, help='Number of equal ranges (default: 200)')
+    parser.add_argument('--workers', type=int, default=None, help='Processes for the parallel run (default: CPU count)')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="split_bench_")
+    try:
+        book = os.path.join(work_dir, "book.pdf")
+        start = time.perf_counter()
+        make_book(book, args.pages)
+        print(f"Generated {args.pages}-page book ({os.path.getsize(book) / 2**20:.1f} MiB) "
+              f"in {time.perf_counter() - start:.2f}s")
+
+        size = max(1, args.pages // args.parts)
+        ranges = [(first, min(first + size - 1, args.pages)) for first in range(1, args.pages + 1, size)]
+
+        timings = {}
+        counts = {}
+        for mode, workers in (("serial", 1), ("parallel", args.workers)):
+            out_dir = os.path.join(work_dir, mode)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                split_pdf_by_ranges(book, ranges, out_dir, workers=workers)
+            timings[mode] = time.perf_counter() - start
+            counts[mode] = page_counts(out_dir)
+            print(f"{mode:>8}: {len(ranges)} parts in {timings[mode]:.2f}s "
+                  f"({len(ranges) / timings[mode]:.1f} parts/s)")
+
+        if counts["serial"] != counts["parallel"]:
+            print("ERROR: serial and parallel outputs differ")
+        print(f"Speedup: {timings['serial'] / timings['parallel']:.2f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
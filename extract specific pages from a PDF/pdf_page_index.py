@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Persistent page-offset index for repeated extractions from large PDFs.
+
+The first time a PDF is opened its cross-reference table and page-tree
+layout are written to a sidecar file (input.pdf.pageidx), keyed by the
+SHA-256 of the PDF. Later opens memory-map both files and parse only the
+objects the requested pages need, instead of reading every xref section
+and walking the whole page tree again.
+
+Sidecar layout: one JSON header line, then fixed-size little-endian records:
+    objects:   type (B), generation (H), offset or object stream (q), index (I)
+    pages:     object number (I), first ancestor (I), ancestor count (I)
+    ancestors: object number (I) of each /Pages node the page inherits from, root first
+The inherited attributes themselves are kept serialized in the header, so
+a page can be loaded without parsing the (possibly huge) /Kids arrays of
+its ancestors.
+
+Usage:
+    python pdf_page_index.py book.pdf          # build (or refresh) the index
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from io import BytesIO
+from typing import List, Optional, Tuple, Union
+
+import PyPDF2
+from PyPDF2 import PageObject
+from PyPDF2.generic import DictionaryObject, IndirectObject, NameObject, NumberObject, read_object
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".pageidx"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdf_page_index")
+
+OBJECT_RECORD = struct.Struct("<BHqI")
+PAGE_RECORD = struct.Struct("<III")
+ANCESTOR_RECORD = struct.Struct("<I")
+
+MISSING, IN_FILE, IN_STREAM, FREE = 0, 1, 2, 3
+
+INHERITABLE_PAGE_ATTRIBUTES = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+def file_sha256(path: str, chunk_size: int = 4 * 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def index_path_for(pdf_path: str) -> str:
+    """Sidecar next to the PDF, or a per-path file in the cache dir if that folder is read-only."""
+    pdf_path = os.path.abspath(pdf_path)
+    if os.access(os.path.dirname(pdf_path), os.W_OK):
+        return pdf_path + INDEX_SUFFIX
+    key = hashlib.sha1(pdf_path.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(DEFAULT_CACHE_DIR, f"{key}{INDEX_SUFFIX}")
+
+
+def build_index(pdf_path: str, index_path: str, sha256: Optional[str] = None) -> bool:
+    """
+    Parse the whole PDF once and write its sidecar index. Returns False for
+    files the index cannot describe (encrypted documents).
+    """
+    st = os.stat(pdf_path)
+    reader = PyPDF2.PdfReader(pdf_path)
+    if reader.is_encrypted:
+        return False
+
+    records = {}
+    for generation, entries in reader.xref.items():
+        for idnum, offset in entries.items():
+            free = reader.xref_free_entry.get(generation, {}).get(idnum)
+            records[idnum] = (FREE if free else IN_FILE, generation, offset, 0)
+    for idnum, (stream_num, position) in reader.xref_objStm.items():
+        records[idnum] = (IN_STREAM, 0, stream_num, position)
+
+    pages = []
+    ancestors = []
+    inherited = {}
+
+    def walk(node_ref: IndirectObject, parents: List[int]) -> None:
+        node = node_ref.get_object()
+        if node.get("/Type", "/Pages") == "/Pages":
+            attributes = {}
+            for attr in INHERITABLE_PAGE_ATTRIBUTES:
+                if attr in node:
+                    data = BytesIO()
+                    node.raw_get(attr).write_to_stream(data, None)
+                    attributes[attr] = data.getvalue().decode('latin-1')
+            if attributes:
+                inherited[str(node_ref.idnum)] = attributes
+                parents = parents + [node_ref.idnum]
+            for kid in node["/Kids"]:
+                walk(kid, parents)
+        else:
+            pages.append((node_ref.idnum, len(ancestors), len(parents)))
+            ancestors.extend(parents)
+
+    root = reader.trailer.raw_get("/Root")
+    walk(reader.trailer["/Root"].raw_get("/Pages"), [])
+
+    info = reader.trailer.raw_get("/Info") if "/Info" in reader.trailer else None
+    header = {
+        "version": INDEX_VERSION,
+        "sha256": sha256 or file_sha256(pdf_path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "root": [root.idnum, root.generation],
+        "info": [info.idnum, info.generation] if isinstance(info, IndirectObject) else None,
+        "objects": max(records, default=-1) + 1,
+        "pages": len(pages),
+        "ancestors": len(ancestors),
+        "inherited": inherited,
+    }
+
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header).encode('utf-8') + b"\n")
+        empty = OBJECT_RECORD.pack(MISSING, 0, 0, 0)
+        for idnum in range(header["objects"]):
+            record = records.get(idnum)
+            f.write(OBJECT_RECORD.pack(*record) if record else empty)
+        for page in pages:
+            f.write(PAGE_RECORD.pack(*page))
+        for ancestor in ancestors:
+            f.write(ANCESTOR_RECORD.pack(ancestor))
+    os.replace(tmp_path, index_path)
+    return True
+
+
+def _load_header(index_path: str) -> Optional[dict]:
+    try:
+        with open(index_path, 'rb') as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return header if header.get("version") == INDEX_VERSION else None
+
+
+def _save_header(index_path: str, header: dict) -> bool:
+    """Rewrite the header line in place. Returns False if it no longer fits (the index is rebuilt)."""
+    line = json.dumps(header).encode('utf-8') + b"\n"
+    with open(index_path, 'r+b') as f:
+        if len(f.readline()) != len(line):
+            return False
+        f.seek(0)
+        f.write(line)
+    return True
+
+
+def ensure_index(pdf_path: str) -> Optional[str]:
+    """
+    Return the path of an up-to-date index for pdf_path, building it if
+    needed, or None if the PDF cannot be indexed. The index belongs to the
+    file's SHA-256: when only size or mtime differ (a copy, a touch) the
+    hash is checked before anything is rebuilt.
+    """
+    index_path = index_path_for(pdf_path)
+    st = os.stat(pdf_path)
+    header = _load_header(index_path)
+    if header and header["size"] == st.st_size and header["mtime_ns"] == st.st_mtime_ns:
+        return index_path
+
+    sha256 = file_sha256(pdf_path)
+    if header and header["sha256"] == sha256:
+        header["size"] = st.st_size
+        header["mtime_ns"] = st.st_mtime_ns
+        try:
+            if _save_header(index_path, header):
+                return index_path
+        except OSError:
+            pass
+
+    try:
+        if not build_index(pdf_path, index_path, sha256):
+            return None
+    except OSError as e:
+        print(f"Warning: could not write page index {index_path}: {e}")
+        return None
+    return index_path
+
+
+class _ObjectTable:
+    """Reads object records straight from the memory-mapped index."""
+
+    def __init__(self, index_map: mmap.mmap, start: int, count: int):
+        self.index_map = index_map
+        self.start = start
+        self.count = count
+
+    def record(self, idnum: int) -> Tuple[int, int, int, int]:
+        if not 0 <= idnum < self.count:
+            return (MISSING, 0, 0, 0)
+        return OBJECT_RECORD.unpack_from(self.index_map, self.start + idnum * OBJECT_RECORD.size)
+
+
+class _OffsetsView:
+    """reader.xref[generation], limited to the lookups PdfReader.get_object makes."""
+
+    def __init__(self, table: _ObjectTable, generation: int):
+        self.table = table
+        self.generation = generation
+        self.overrides = {}
+
+    def __contains__(self, idnum: int) -> bool:
+        if idnum in self.overrides:
+            return True
+        kind, generation, _, _ = self.table.record(idnum)
+        return kind in (IN_FILE, FREE) and generation == self.generation
+
+    def __getitem__(self, idnum: int) -> int:
+        if idnum in self.overrides:
+            return self.overrides[idnum]
+        if idnum not in self:
+            raise KeyError(idnum)
+        return self.table.record(idnum)[2]
+
+    def __setitem__(self, idnum: int, offset: int) -> None:
+        # PdfReader corrects bad offsets it finds while reading
+        self.overrides[idnum] = offset
+
+    def get(self, idnum: int, default=None):
+        return self[idnum] if idnum in self else default
+
+
+class _FreeView:
+    def __init__(self, table: _ObjectTable, generation: int):
+        self.table = table
+        self.generation = generation
+
+    def get(self, idnum: int, default=None):
+        kind, generation, _, _ = self.table.record(idnum)
+        return kind == FREE and generation == self.generation
+
+
+class _GenerationMap:
+    """Dict-like {generation: view} creating views on first use."""
+
+    def __init__(self, table: _ObjectTable, view_type):
+        self.table = table
+        self.view_type = view_type
+        self.views = {}
+
+    def __contains__(self, generation: int) -> bool:
+        return True
+
+    def __getitem__(self, generation: int):
+        if generation not in self.views:
+            self.views[generation] = self.view_type(self.table, generation)
+        return self.views[generation]
+
+    def get(self, generation: int, default=None):
+        return self[generation]
+
+
+class _ObjectStreamView:
+    """reader.xref_objStm: object number -> (object stream number, index)."""
+
+    def __init__(self, table: _ObjectTable):
+        self.table = table
+
+    def __contains__(self, idnum: int) -> bool:
+        return self.table.record(idnum)[0] == IN_STREAM
+
+    def __getitem__(self, idnum: int) -> Tuple[int, int]:
+        kind, _, stream_num, position = self.table.record(idnum)
+        if kind != IN_STREAM:
+            raise KeyError(idnum)
+        return stream_num, position
+
+
+class IndexedPdfReader(PyPDF2.PdfReader):
+    """
+    PdfReader that takes its xref and page list from a sidecar index and
+    reads objects from a memory-mapped file, so opening is O(1) and only the
+    pages that are accessed (and the objects they use) are parsed.
+    """
+
+    def __init__(self, pdf_path: str, index_path: str):
+        with open(pdf_path, 'rb') as f:
+            self.stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(index_path, 'rb') as f:
+            self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._index_map.find(b"\n") + 1
+        header = json.loads(self._index_map[:header_end])
+
+        self.strict = False
+        self.flattened_pages = None
+        self.resolved_objects = {}
+        self.xref_index = 0
+        self._page_id2num = None
+        self._override_encryption = False
+        self._encryption = None
+
+        table = _ObjectTable(self._index_map, header_end, header["objects"])
+        self._table = table
+        self.xref = _GenerationMap(table, _OffsetsView)
+        self.xref_free_entry = _GenerationMap(table, _FreeView)
+        self.xref_objStm = _ObjectStreamView(table)
+
+        self.trailer = DictionaryObject()
+        self.trailer[NameObject("/Size")] = NumberObject(header["objects"])
+        self.trailer[NameObject("/Root")] = IndirectObject(*header["root"], self)
+        if header["info"]:
+            self.trailer[NameObject("/Info")] = IndirectObject(*header["info"], self)
+
+        self._inherited = header["inherited"]
+        self._page_count = header["pages"]
+        self._pages_start = header_end + header["objects"] * OBJECT_RECORD.size
+        self._ancestors_start = self._pages_start + header["pages"] * PAGE_RECORD.size
+        self._page_cache = {}
+
+    def _get_num_pages(self) -> int:
+        return self._page_count
+
+    def _reference(self, idnum: int) -> IndirectObject:
+        return IndirectObject(idnum, self._table.record(idnum)[1], self)
+
+    def _get_page(self, page_number: int) -> PageObject:
+        if page_number < 0:
+            page_number += self._page_count
+        if not 0 <= page_number < self._page_count:
+            raise IndexError("page index out of range")
+        page = self._page_cache.get(page_number)
+        if page is not None:
+            return page
+
+        idnum, first, count = PAGE_RECORD.unpack_from(
+            self._index_map, self._pages_start + page_number * PAGE_RECORD.size)
+        # Same inheritance as PdfReader._flatten: the nearest /Pages ancestor wins
+        inherit = {}
+        for i in range(first, first + count):
+            (ancestor,) = ANCESTOR_RECORD.unpack_from(self._index_map, self._ancestors_start + i * ANCESTOR_RECORD.size)
+            for attr, data in self._inherited[str(ancestor)].items():
+                inherit[NameObject(attr)] = read_object(BytesIO(data.encode('latin-1')), self)
+
+        reference = self._reference(idnum)
+        page_dict = reference.get_object()
+        for attr, value in inherit.items():
+            if attr not in page_dict:
+                page_dict[attr] = value
+        page = PageObject(self, reference)
+        page.update(page_dict)
+        self._page_cache[page_number] = page
+        return page
+
+    def close(self) -> None:
+        self.stream.close()
+        self._index_map.close()
+
+    def __enter__(self) -> "IndexedPdfReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def close_pdf(reader: Union[IndexedPdfReader, PyPDF2.PdfReader]) -> None:
+    """Release a reader from open_pdf: unmaps an indexed reader; a plain PdfReader holds nothing open."""
+    if isinstance(reader, IndexedPdfReader):
+        reader.close()
+
+
+def open_pdf(pdf_path: str) -> Union[IndexedPdfReader, PyPDF2.PdfReader]:
+    """
+    Open pdf_path through its page index, or with a plain PdfReader if it
+    cannot be indexed. Release it with close_pdf() once done.
+    """
+    try:
+        index_path = ensure_index(pdf_path)
+    except Exception as e:
+        print(f"Warning: page index unavailable for {pdf_path}: {e}")
+        index_path = None
+    if index_path is None:
+        return PyPDF2.PdfReader(pdf_path)
+    return IndexedPdfReader(pdf_path, index_path)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python pdf_page_index.py input.pdf")
+        sys.exit(1)
+    index_path = ensure_index(sys.argv[1])
+    if index_path is None:
+        print(f"Cannot index {sys.argv[1]} (encrypted?)")
+        sys.exit(1)
+    print(f"Page index: {index_path}")
+
+
+if __name__ == "__main__":
+    main()
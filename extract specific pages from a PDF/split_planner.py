@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Automatic split planning for DynamicallyExtractPages.
+
+Estimates what every page costs in an output file from the object graph
+(page dict, content streams, fonts, images...) in a single parse, then
+turns that into (start, end) ranges for split_pdf_by_ranges:
+
+    plan_by_size     pack consecutive pages into parts under a byte limit
+    plan_by_outline  cut at top-level outline entries (chapters), merging
+                     small chapters and packing oversized ones by size
+
+Objects shared by several pages are counted once per part, as the writer
+stores them once per part.
+"""
+
+import os
+import re
+from io import BytesIO
+from typing import Dict, List, Optional, Set, Tuple
+
+import PyPDF2
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+
+# Header, catalog, page tree, xref and trailer of each written part
+PART_OVERHEAD_BYTES = 1024
+
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3,
+              "KIB": 1024, "MIB": 1024 ** 2, "GIB": 1024 ** 3}
+
+
+def parse_size(size_str: str) -> int:
+    """Parse a byte count such as "20MB", "500 KiB" or "1048576"."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([A-Za-z]*)\s*", size_str)
+    if not match or match.group(2).upper() not in SIZE_UNITS:
+        raise ValueError(f"Invalid size '{size_str}'. Use e.g. 20MB, 500KiB or a byte count.")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def _object_sizes(reader: PyPDF2.PdfReader, file_size: int) -> Dict[int, int]:
+    """Bytes each top-level object takes in the file, from the gaps between xref offsets."""
+    offsets = sorted(
+        (offset, idnum)
+        for generation, entries in reader.xref.items()
+        for idnum, offset in entries.items()
+        if not reader.xref_free_entry.get(generation, {}).get(idnum)
+    )
+    sizes = {}
+    for (offset, idnum), (next_offset, _) in zip(offsets, offsets[1:] + [(file_size, None)]):
+        sizes[idnum] = max(0, next_offset - offset)
+    return sizes
+
+
+class PageSizeEstimator:
+    """Maps every page to the objects it needs and what each of them costs."""
+
+    def __init__(self, reader: PyPDF2.PdfReader, file_size: int):
+        self.reader = reader
+        self.sizes = _object_sizes(reader, file_size)
+        self.page_ids = {page.indirect_reference.idnum for page in reader.pages}
+
+    def object_size(self, idnum: int, obj) -> int:
+        size = self.sizes.get(idnum)
+        if size is None:
+            # Objects inside object streams are written out uncompressed
+            data = BytesIO()
+            obj.write_to_stream(data, None)
+            size = self.sizes[idnum] = len(data.getvalue()) + 20
+        return size
+
+    def page_objects(self, page) -> Dict[int, int]:
+        """{object number: bytes} reachable from a page, without following /Parent or other pages."""
+        start = page.indirect_reference.idnum
+        found = {start: self.object_size(start, page)}
+        stack = [page]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, DictionaryObject):
+                values = [value for key, value in obj.items() if key != "/Parent"]
+            elif isinstance(obj, ArrayObject):
+                values = list(obj)
+            else:
+                continue
+            for value in values:
+                if isinstance(value, IndirectObject):
+                    if value.idnum in found or value.idnum in self.page_ids:
+                        continue
+                    target = value.get_object()
+                    found[value.idnum] = self.object_size(value.idnum, target)
+                    stack.append(target)
+                else:
+                    stack.append(value)
+        return found
+
+    def estimate(self) -> List[Dict[int, int]]:
+        """One {object number: bytes} dict per page."""
+        return [self.page_objects(page) for page in self.reader.pages]
+
+
+def estimate_page_objects(pdf_path: str) -> List[Dict[int, int]]:
+    """Parse the PDF once and return {object number: bytes} for every page."""
+    reader = PyPDF2.PdfReader(pdf_path)
+    return PageSizeEstimator(reader, os.path.getsize(pdf_path)).estimate()
+
+
+def pack_pages(page_objects: List[Dict[int, int]], max_bytes: int,
+               first: int = 1, last: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Greedily pack pages first..last (1-based) into consecutive ranges whose
+    estimated size stays under max_bytes. A single page larger than the
+    limit still gets a part of its own.
+    """
+    last = len(page_objects) if last is None else last
+    ranges = []
+    start = first
+    used: Set[int] = set()
+    size = PART_OVERHEAD_BYTES
+    for number in range(first, last + 1):
+        objects = page_objects[number - 1]
+        added = sum(bytes_ for idnum, bytes_ in objects.items() if idnum not in used)
+        if number > start and size + added > max_bytes:
+            ranges.append((start, number - 1))
+            start = number
+            used = set()
+            size = PART_OVERHEAD_BYTES
+            added = sum(objects.values())
+        used.update(objects)
+        size += added
+    if start <= last:
+        ranges.append((start, last))
+    return ranges
+
+
+def part_size(page_objects: List[Dict[int, int]], start: int, end: int) -> int:
+    """Estimated bytes of a part holding pages start..end (1-based)."""
+    objects: Dict[int, int] = {}
+    for number in range(start, end + 1):
+        objects.update(page_objects[number - 1])
+    return PART_OVERHEAD_BYTES + sum(objects.values())
+
+
+def plan_by_size(pdf_path: str, max_bytes: int) -> List[Tuple[int, int]]:
+    return pack_pages(estimate_page_objects(pdf_path), max_bytes)
+
+
+def chapter_starts(reader: PyPDF2.PdfReader) -> List[int]:
+    """1-based first pages of the top-level outline entries, in page order."""
+    starts = set()
+    for entry in reader.outline:
+        if isinstance(entry, list):
+            continue  # children of the previous entry
+        try:
+            page = reader.get_destination_page_number(entry)
+        except Exception:
+            continue
+        if page is not None and page >= 0:
+            starts.add(page + 1)
+    return sorted(starts)
+
+
+def plan_by_outline(pdf_path: str, max_bytes: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Cut at chapter boundaries from the PDF outline. With max_bytes,
+    neighbouring chapters are merged while they fit and a chapter that is
+    too large on its own is packed by size.
+    """
+    reader = PyPDF2.PdfReader(pdf_path)
+    total = len(reader.pages)
+    starts = [s for s in chapter_starts(reader) if s <= total]
+    if not starts or starts[0] != 1:
+        starts.insert(0, 1)  # front matter before the first chapter
+    chapters = [(start, end - 1) for start, end in zip(starts, starts[1:] + [total + 1])]
+    if max_bytes is None:
+        return chapters
+
+    page_objects = PageSizeEstimator(reader, os.path.getsize(pdf_path)).estimate()
+    ranges = []
+    for start, end in chapters:
+        if ranges and part_size(page_objects, ranges[-1][0], end) <= max_bytes:
+            ranges[-1] = (ranges[-1][0], end)
+        elif part_size(page_objects, start, end) <= max_bytes:
+            ranges.append((start, end))
+        else:
+            ranges.extend(pack_pages(page_objects, max_bytes, start, end))
+    return ranges
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the answer key renderers in generate_pdfs.
+
+Renders generated exams of 1k to 100k questions with the platypus
+doc.build path and the canvas fast path, and reports wall time, time per
+question and page count. Platypus is skipped above --max-platypus
+questions, as it gets slow there.
+
+Usage:
+    python bench_generate_pdfs.py --sizes 1000 10000 100000
+    python bench_generate_pdfs.py --sizes 1000 --output results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from PyPDF2 import PdfReader
+
+from generate_pdfs import build_styles, render_answer_key
+
+WORDS = ("the process file system kernel signal memory user root path network "
+         "command output shell permission directory daemon socket mount").split()
+
+
+def make_exam(questions, seed=0, per_section=50):
+    """Exam data with questions of varying length, some spanning several lines."""
+    rng = random.Random(seed)
+
+    def sentence(low, high):
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+    sections = []
+    for start in range(0, questions, per_section):
+        section_questions = []
+        for number in range(start + 1, min(start + per_section, questions) + 1):
+            options = [sentence(1, 25) for _ in range(4)]
+            correct = rng.sample(range(4), 2) if rng.random() < 0.1 else rng.randrange(4)
+            section_questions.append({
+                "question": f"{number}. {sentence(5, 40)} (1 Point)",
+                "options": options,
+                "correct": correct,
+            })
+        sections.append({"section": f"Section {len(sections) + 1}: {sentence(1, 4)}",
+                         "questions": section_questions})
+    return {
+        "title": "Benchmark Exam",
+        "subtitle": f"{questions} questions",
+        "sections": sections,
+        "summary": f"<b>Total Questions:</b> {questions}<br/>",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the platypus and canvas answer key renderers.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='Question counts')
+    parser.add_argument('--max-platypus', type=int, default=10000,
+                        help='Skip the platypus renderer above this many questions (default: 10000)')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="answer_key_bench_")
+    styles = build_styles()
+    results = []
+    print(f"{'questions':>9} {'mode':>8} {'seconds':>9} {'ms/q':>7} {'pages':>6}")
+    try:
+        for size in args.sizes:
+            data = make_exam(size)
+            modes = [("canvas", True)]
+            if size <= args.max_platypus:
+                modes.insert(0, ("platypus", False))
+            for mode, fast in modes:
+                output_pdf = os.path.join(work_dir, f"{mode}_{size}.pdf")
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    render_answer_key(data, output_pdf, styles, fast=fast)
+                elapsed = time.perf_counter() - start
+                pages = len(PdfReader(output_pdf).pages)
+                results.append({"questions": size, "mode": mode, "seconds": elapsed, "pages": pages,
+                                "bytes": os.path.getsize(output_pdf)})
+                print(f"{size:>9} {mode:>8} {elapsed:>9.2f} {elapsed / size * 1000:>7.3f} {pages:>6}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({"results": results}, f, indent=2)
+            print(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
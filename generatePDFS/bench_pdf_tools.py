@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for the repo's PDF tools on a synthetic corpus.
+
+Generates (or reuses) a seeded corpus with generate_pdfs.generate_corpus,
+then times merge_pdfs, split_pdf_by_ranges, extract_pages and the
+background recolor on it. Each case runs in a fresh process so its peak
+RSS is its own; pools started by a tool are included through the child
+rusage. The JSON report records the commit, so runs of two commits can be
+compared with --compare.
+
+Usage:
+    python bench_pdf_tools.py --preset medium --seed 0 --output report.json
+    python bench_pdf_tools.py --corpus corpus/ --output new.json --compare old.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from generate_pdfs import CORPUS_PRESETS, generate_corpus
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOL_DIRS = [
+    os.path.join(REPO_ROOT, "merge_pdfs"),
+    os.path.join(REPO_ROOT, "extract specific pages from a PDF"),
+    os.path.join(REPO_ROOT, "Change pdf background color"),
+]
+
+CASES = ["merge", "split", "extract", "extract-indexed", "recolor", "recolor-directory"]
+
+
+def _case_merge(corpus, work_dir, files, largest):
+    from pdf_merger import merge_pdfs
+    merge_pdfs(files, "merged.pdf", work_dir, workers=1)
+
+
+def _case_split(corpus, work_dir, files, largest):
+    from DynamicallyExtractPages import split_pdf_by_ranges
+    pages = largest["pages"]
+    step = max(1, pages // 10)
+    ranges = [(start, min(start + step - 1, pages)) for start in range(1, pages + 1, step)]
+    split_pdf_by_ranges(largest["path"], ranges, os.path.join(work_dir, "parts"), workers=1)
+
+
+def _case_extract(corpus, work_dir, files, largest):
+    # Cold: builds the .pageidx sidecar next to a private copy of the input
+    from Extract_pages import extract_pages
+    source = os.path.join(work_dir, "extract_input.pdf")
+    shutil.copyfile(largest["path"], source)
+    extract_pages(source, os.path.join(work_dir, "extract.pdf"), 1, min(3, largest["pages"]))
+
+
+def _case_extract_indexed(corpus, work_dir, files, largest):
+    # Warm: the sidecar written by the "extract" case is reused
+    from Extract_pages import extract_pages
+    source = os.path.join(work_dir, "extract_input.pdf")
+    if not os.path.exists(source):
+        _case_extract(corpus, work_dir, files, largest)
+    extract_pages(source, os.path.join(work_dir, "extract.pdf"), 1, min(3, largest["pages"]))
+
+
+def _case_recolor(corpus, work_dir, files, largest):
+    from Change_BG_color_PDFs import DEFAULT_COLOR, change_background_color
+    change_background_color(largest["path"], os.path.join(work_dir, "recolored.pdf"), DEFAULT_COLOR)
+
+
+def _case_recolor_directory(corpus, work_dir, files, largest):
+    from Change_BG_color_PDFs import DEFAULT_COLOR, recolor_directory
+    recolor_directory(corpus, os.path.join(work_dir, "recolored"), DEFAULT_COLOR, processes=1,
+                      cache_dir=os.path.join(work_dir, "cache"))
+
+
+CASE_FUNCTIONS = {
+    "merge": _case_merge,
+    "split": _case_split,
+    "extract": _case_extract,
+    "extract-indexed": _case_extract_indexed,
+    "recolor": _case_recolor,
+    "recolor-directory": _case_recolor_directory,
+}
+
+
+def _run_case(case, corpus, work_dir, files, largest):
+    """Runs inside a fresh process: time one case and report this process's peak RSS."""
+    sys.path[:0] = TOOL_DIRS
+    # ru_maxrss is in KiB on Linux
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        CASE_FUNCTIONS[case](corpus, work_dir, files, largest)
+    elapsed = time.perf_counter() - start
+    peak_self = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    peak_children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+    return {"seconds": elapsed, "rss_before_bytes": rss_before,
+            "peak_rss_bytes": max(peak_self, peak_children)}
+
+
+def run_case(case, corpus, work_dir, files, largest):
+    """Run one case in a spawned process, so no memory is inherited from this one."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_case, case, corpus, work_dir, files, largest).result()
+
+
+def git_commit():
+    """(commit, dirty) of the working tree, or (None, None) outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def load_corpus(corpus_dir):
+    with open(os.path.join(corpus_dir, "corpus.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(report, baseline_path):
+    """Print time and peak RSS of this run relative to an earlier report."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if (baseline.get("corpus", {}).get("preset"), baseline.get("corpus", {}).get("seed")) != \
+            (report["corpus"]["preset"], report["corpus"]["seed"]):
+        print("Warning: baseline was run on a different corpus")
+    old = {result["case"]: result for result in baseline.get("results", [])}
+    print(f"\nAgainst {baseline_path} ({(baseline.get('commit') or 'unknown')[:10]}):")
+    print(f"{'case':>18} {'old s':>9} {'new s':>9} {'time':>7} {'RSS':>7}")
+    for result in report["results"]:
+        before = old.get(result["case"])
+        if not before:
+            continue
+        time_ratio = result["seconds"] / before["seconds"] if before["seconds"] else float("nan")
+        rss_ratio = result["peak_rss_bytes"] / before["peak_rss_bytes"] if before["peak_rss_bytes"] else float("nan")
+        print(f"{result['case']:>18} {before['seconds']:>9.2f} {result['seconds']:>9.2f} "
+              f"{time_ratio:>6.2f}x {rss_ratio:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the PDF tools on a synthetic corpus and record peak RSS.")
+    parser.add_argument('--corpus', help='Existing corpus directory (with corpus.json) to reuse')
+    parser.add_argument('--preset', choices=CORPUS_PRESETS, default='small', help='Corpus to generate (default: small)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=CASES, help='Cases to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per case; the fastest is kept (default: 1)')
+    parser.add_argument('--output', default='bench_report.json', help='JSON report (default: bench_report.json)')
+    parser.add_argument('--compare', metavar='BASELINE', help='Earlier JSON report to compare against')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="pdf_tools_bench_")
+    try:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = os.path.join(work_dir, "corpus")
+            generate_corpus(corpus, args.preset, args.seed)
+        manifest = load_corpus(corpus)
+        files = [os.path.join(corpus, entry["name"]) for entry in manifest["documents"]]
+        largest = max(manifest["documents"], key=lambda entry: entry["pages"])
+        largest = {"path": os.path.join(corpus, largest["name"]), "pages": largest["pages"]}
+
+        results = []
+        print(f"{'case':>18} {'seconds':>9} {'peak MiB':>9}")
+        for case in args.cases:
+            runs = []
+            for _ in range(args.repeat):
+                case_dir = os.path.join(work_dir, "out")
+                if case != "extract-indexed":
+                    shutil.rmtree(case_dir, ignore_errors=True)
+                os.makedirs(case_dir, exist_ok=True)
+                runs.append(run_case(case, corpus, case_dir, files, largest))
+            best = min(runs, key=lambda run: run["seconds"])
+            results.append({"case": case, **best})
+            print(f"{case:>18} {best['seconds']:>9.3f} {best['peak_rss_bytes'] / 2**20:>9.1f}")
+
+        commit, dirty = git_commit()
+        report = {
+            "commit": commit,
+            "dirty": dirty,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus": {key: value for key, value in manifest.items() if key != "documents"} | {
+                "total_pages": sum(entry["pages"] for entry in manifest["documents"]),
+                "total_bytes": sum(entry["bytes"] for entry in manifest["documents"]),
+            },
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to: {args.output}")
+        if args.compare:
+            compare(report, args.compare)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
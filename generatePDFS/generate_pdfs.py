@@ -1,36 +1,25 @@
+import argparse
 import json
+import os
+import random
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas as pdf_canvas
+from PIL import Image
 
 
-def create_exam_answer_key(json_file, output_pdf):
-    """
-    Generate a PDF answer key from JSON data
-    
-    Args:
-        json_file: Path to JSON file with exam data
-        output_pdf: Path for output PDF file
-    """
-    
-    # Load JSON data
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Create PDF
-    doc = SimpleDocTemplate(
-        output_pdf,
-        pagesize=letter,
-        rightMargin=50,
-        leftMargin=50,
-        topMargin=50,
-        bottomMargin=50
-    )
-    
-    elements = []
+def build_styles():
+    """Create the paragraph styles used by the answer key."""
     styles = getSampleStyleSheet()
     
     # Define custom styles
@@ -94,46 +83,720 @@ def create_exam_answer_key(json_file, output_pdf):
         fontName='Helvetica-Bold'
     )
     
-    # Add header
-    elements.append(Paragraph(data["title"], title_style))
-    elements.append(Paragraph(data["subtitle"], subtitle_style))
-    elements.append(Spacer(1, 0.2*inch))
+    return {
+        "title": title_style,
+        "subtitle": subtitle_style,
+        "question": question_style,
+        "option": option_style,
+        "correct_option": correct_option_style,
+        "section": section_style,
+        "normal": styles['Normal'],
+    }
+
+
+def header_elements(data, styles):
+    """Title, subtitle and the gap below them."""
+    return [
+        Paragraph(data["title"], styles["title"]),
+        Paragraph(data["subtitle"], styles["subtitle"]),
+        Spacer(1, 0.2*inch),
+    ]
+
+
+def section_elements(section_name, styles):
+    return [Paragraph(section_name, styles["section"]), Spacer(1, 0.1*inch)]
+
+
+def question_elements(q_data, styles):
+    """One question followed by all of its options, correct ones marked."""
+    # Add question
+    elements = [Paragraph(q_data["question"], styles["question"])]
+    
+    # Handle multiple correct answers
+    correct_answers = q_data["correct"] if isinstance(q_data["correct"], list) else [q_data["correct"]]
+    
+    # Add options
+    for i, option in enumerate(q_data["options"]):
+        if i in correct_answers:
+            # Correct answer in green with checkmark
+            elements.append(Paragraph(f"<b>✓ {option}</b>", styles["correct_option"]))
+        else:
+            # Incorrect option
+            elements.append(Paragraph(f"○ {option}", styles["option"]))
+    
+    elements.append(Spacer(1, 0.15*inch))
+    return elements
+
+
+def summary_elements(summary, styles):
+    return [
+        PageBreak(),
+        Paragraph("Summary", styles["title"]),
+        Spacer(1, 0.2*inch),
+        Paragraph(summary, styles["normal"]),
+    ]
+
+
+def build_elements(data, styles):
+    """Turn exam data into the list of flowables for doc.build."""
+    elements = header_elements(data, styles)
     
     # Generate questions
     for section_data in data["sections"]:
-        elements.append(Paragraph(section_data["section"], section_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
+        elements.extend(section_elements(section_data["section"], styles))
         for q_data in section_data["questions"]:
-            # Add question
-            elements.append(Paragraph(q_data["question"], question_style))
-            
-            # Handle multiple correct answers
-            correct_answers = q_data["correct"] if isinstance(q_data["correct"], list) else [q_data["correct"]]
-            
-            # Add options
-            for i, option in enumerate(q_data["options"]):
-                if i in correct_answers:
-                    # Correct answer in green with checkmark
-                    elements.append(Paragraph(f"<b>✓ {option}</b>", correct_option_style))
-                else:
-                    # Incorrect option
-                    elements.append(Paragraph(f"○ {option}", option_style))
-            
-            elements.append(Spacer(1, 0.15*inch))
+            elements.extend(question_elements(q_data, styles))
     
     # Add summary if exists
     if "summary" in data:
-        elements.append(PageBreak())
-        elements.append(Paragraph("Summary", title_style))
-        elements.append(Spacer(1, 0.2*inch))
-        elements.append(Paragraph(data["summary"], styles['Normal']))
+        elements.extend(summary_elements(data["summary"], styles))
+    
+    return elements
+
+
+def render_answer_key(data, output_pdf, styles=None, fast=False):
+    """
+    Render already-loaded exam data to output_pdf, reusing styles if given.
+    fast=True draws straight onto the canvas (see CanvasAnswerKeyRenderer).
+    """
+    if styles is None:
+        styles = build_styles()
+    if fast:
+        CanvasAnswerKeyRenderer(output_pdf, styles).render(data)
+        return
+    
+    # Create PDF
+    doc = SimpleDocTemplate(
+        output_pdf,
+        pagesize=letter,
+        rightMargin=50,
+        leftMargin=50,
+        topMargin=50,
+        bottomMargin=50
+    )
     
     # Build PDF
-    doc.build(elements)
+    doc.build(build_elements(data, styles))
+
+
+PAGE_MARGIN = 50
+FRAME_PADDING = 6  # SimpleDocTemplate's frame padding, kept so both renderers line up
+
+
+class CanvasAnswerKeyRenderer:
+    """
+    Fast renderer for the fixed answer-key layout. Plain question and option
+    lines are wrapped with cached word widths and drawn straight onto the
+    canvas with the same styles, spacing and margins as the platypus build.
+    Text with markup (tags or entities), and the summary, still goes through
+    a platypus Paragraph drawn on the same canvas.
+    """
+    
+    def __init__(self, output_pdf, styles, pagesize=letter):
+        self.canv = pdf_canvas.Canvas(output_pdf, pagesize=pagesize)
+        self.styles = styles
+        page_width, page_height = pagesize
+        self.left = PAGE_MARGIN + FRAME_PADDING
+        self.width = page_width - 2 * (PAGE_MARGIN + FRAME_PADDING)
+        self.top = page_height - PAGE_MARGIN - FRAME_PADDING
+        self.bottom = PAGE_MARGIN + FRAME_PADDING
+        self.y = self.top
+        self.page_has_content = False
+        self.width_cache = {}  # (font, size) -> {word: width}
+    
+    def render(self, data):
+        self.header(data["title"], data["subtitle"])
+        for section_data in data["sections"]:
+            self.section(section_data["section"])
+            for q_data in section_data["questions"]:
+                self.question(q_data)
+        if "summary" in data:
+            self.summary(data["summary"])
+        self.save()
+    
+    def render_events(self, events):
+        """Render from iter_exam_events, one section/question at a time."""
+        header = {}
+        header_done = False
+        summary = None
+        for kind, value in events:
+            if kind in ("title", "subtitle"):
+                header[kind] = value
+            elif kind == "summary":
+                summary = value
+            elif kind in ("section", "question"):
+                if not header_done:
+                    if len(header) < 2:
+                        raise ValueError("Streaming needs \"title\" and \"subtitle\" before \"sections\"")
+                    self.header(header["title"], header["subtitle"])
+                    header_done = True
+                if kind == "section":
+                    self.section(value)
+                else:
+                    self.question(value)
+        if not header_done:
+            self.header(header["title"], header["subtitle"])
+        if summary is not None:
+            self.summary(summary)
+        self.save()
+    
+    def header(self, title, subtitle):
+        self.text(title, self.styles["title"])
+        self.text(subtitle, self.styles["subtitle"])
+        self.space(0.2*inch)
+    
+    def section(self, section_name):
+        self.text(section_name, self.styles["section"])
+        self.space(0.1*inch)
+    
+    def question(self, q_data):
+        styles = self.styles
+        self.text(q_data["question"], styles["question"])
+        correct_answers = q_data["correct"] if isinstance(q_data["correct"], list) else [q_data["correct"]]
+        for i, option in enumerate(q_data["options"]):
+            if i in correct_answers:
+                self.text(f"✓ {option}", styles["correct_option"])
+            else:
+                self.text(f"○ {option}", styles["option"])
+        self.space(0.15*inch)
+    
+    def summary(self, summary):
+        self.new_page()
+        self.text("Summary", self.styles["title"])
+        self.space(0.2*inch)
+        self.paragraph(Paragraph(summary, self.styles["normal"]))
+    
+    def save(self):
+        self.canv.save()
+    
+    def new_page(self):
+        if self.page_has_content:
+            self.canv.showPage()
+        self.y = self.top
+        self.page_has_content = False
+    
+    def space(self, height):
+        # Like a platypus Spacer: one that does not fit moves to the next page
+        if self.page_has_content and self.y - height < self.bottom:
+            self.new_page()
+        self.y -= height
+        self.page_has_content = True
+    
+    def word_width(self, word, font, size):
+        widths = self.width_cache.get((font, size))
+        if widths is None:
+            widths = self.width_cache[(font, size)] = {}
+        width = widths.get(word)
+        if width is None:
+            width = widths[word] = stringWidth(word, font, size)
+        return width
+    
+    def wrap(self, text, style, max_width):
+        """
+        Greedy word wrap matching Paragraph's for a single font: a line may
+        overrun by style.spaceShrinkage of its spaces, which are then squeezed
+        when drawn. Returns [(line, width, spaces)], or None if a word is
+        wider than the line and would need Paragraph's long-word splitting.
+        """
+        font, size = style.fontName, style.fontSize
+        space = self.word_width(" ", font, size)
+        shrink = style.spaceShrinkage * space
+        lines = []
+        line = []
+        line_width = 0
+        for word in text.split():
+            width = self.word_width(word, font, size)
+            if width > max_width:
+                return None
+            if line and line_width + space + width > max_width + shrink * len(line):
+                lines.append((" ".join(line), line_width, len(line) - 1))
+                line = [word]
+                line_width = width
+            else:
+                line_width += (space if line else 0) + width
+                line.append(word)
+        if line:
+            lines.append((" ".join(line), line_width, len(line) - 1))
+        return lines
+    
+    def text(self, text, style):
+        max_width = self.width - style.leftIndent - style.rightIndent
+        lines = None
+        if "<" not in text and "&" not in text:
+            lines = self.wrap(text, style, max_width)
+        if lines is None:
+            # Rich markup or over-long words: let platypus handle it
+            self.paragraph(Paragraph(text, style))
+            return
+        
+        canv = self.canv
+        while lines:
+            space_before = style.spaceBefore if self.page_has_content else 0
+            available = self.y - space_before - self.bottom
+            fit = len(lines)
+            if len(lines) * style.leading > available:
+                # Split over pages the way Paragraph.split does
+                fit = int(available / style.leading) if available > 0 else 0
+                if not style.allowWidows and len(lines) == fit + 1:
+                    if len(lines) > 3 or (style.allowOrphans and len(lines) == 3):
+                        fit -= 1
+                    else:
+                        fit = 0
+                if fit == 0 or (fit == 1 and not style.allowOrphans):
+                    if self.page_has_content:
+                        self.new_page()
+                        continue
+                    fit = max(fit, 1)  # taller than a whole page
+            
+            top = self.y - space_before
+            canv.setFont(style.fontName, style.fontSize)
+            canv.setFillColor(style.textColor)
+            baseline = top - style.fontSize
+            for line, line_width, spaces in lines[:fit]:
+                x = self.left + style.leftIndent
+                if line_width > max_width:
+                    # Squeeze the spaces so the line ends at the margin
+                    text_object = canv.beginText(x, baseline)
+                    text_object.setWordSpace((max_width - line_width) / spaces)
+                    text_object.textOut(line)
+                    text_object.setWordSpace(0)  # Tw outlives the text object
+                    canv.drawText(text_object)
+                else:
+                    if style.alignment == TA_CENTER:
+                        x += (max_width - line_width) / 2
+                    canv.drawString(x, baseline, line)
+                baseline -= style.leading
+            self.y = top - fit * style.leading
+            self.page_has_content = True
+            lines = lines[fit:]
+            if lines:
+                self.new_page()
+        self.y -= style.spaceAfter
+    
+    def paragraph(self, para):
+        """Draw a platypus Paragraph at the current position, splitting it over pages if needed."""
+        while para is not None:
+            space_before = para.getSpaceBefore() if self.page_has_content else 0
+            available = self.y - space_before - self.bottom
+            _, height = para.wrap(self.width, available)
+            parts = [para]
+            if height > available:
+                parts = para.split(self.width, available)
+                if len(parts) < 2:
+                    if self.page_has_content:
+                        self.new_page()
+                        continue
+                    parts = [para]  # taller than a page and cannot split
+                _, height = parts[0].wrap(self.width, available)
+            parts[0].drawOn(self.canv, self.left, self.y - space_before - height)
+            self.y -= space_before + height + parts[0].getSpaceAfter()
+            self.page_has_content = True
+            para = parts[1] if len(parts) > 1 else None
+            if para is not None:
+                self.new_page()
+
+
+def create_exam_answer_key(json_file, output_pdf, fast=False):
+    """
+    Generate a PDF answer key from JSON data
+    
+    Args:
+        json_file: Path to JSON file with exam data
+        output_pdf: Path for output PDF file
+        fast: Draw directly on the canvas instead of using the platypus layout engine
+    """
+    
+    # Load JSON data
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    render_answer_key(data, output_pdf, fast=fast)
     print(f"PDF created successfully: {output_pdf}")
 
 
+class _JsonStream:
+    """Minimal incremental reader over a JSON text file: values are decoded one at a time."""
+    
+    def __init__(self, f, read_size=1 << 16):
+        self.f = f
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+    
+    def _fill(self):
+        data = self.f.read(self.read_size)
+        if not data:
+            return False
+        # Drop what has been consumed so the buffer stays small
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+    
+    def peek(self):
+        """Next non-whitespace character (not consumed), or "" at end of file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in exam JSON, found '{found or 'end of file'}'")
+        self.pos += 1
+    
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number may continue past the end of the buffer
+                if end < len(self.buffer) or not isinstance(value, (int, float)) or not self._fill():
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+    
+    def items(self):
+        """Iterate over the keys of an object; the caller must consume each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+    
+    def elements(self):
+        """Iterate over an array; the caller must consume each element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def iter_exam_events(json_file):
+    """
+    Read an exam JSON file incrementally, yielding ("title", str),
+    ("subtitle", str), ("section", name), ("question", dict) and
+    ("summary", str). Top-level keys come in file order; within a section
+    the name always comes before its questions, whatever the key order.
+    Only one question is decoded at a time, unless a section lists its
+    questions before its name: those are held until the name is read.
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f)
+        for key in stream.items():
+            if key != "sections":
+                yield key, stream.value()
+                continue
+            for _ in stream.elements():
+                named = False
+                pending = []  # questions read before the section name
+                for section_key in stream.items():
+                    if section_key == "questions":
+                        for _ in stream.elements():
+                            if named:
+                                yield "question", stream.value()
+                            else:
+                                pending.append(stream.value())
+                    elif section_key == "section":
+                        yield "section", stream.value()
+                        named = True
+                        yield from (("question", question) for question in pending)
+                        pending = []
+                    else:
+                        stream.value()
+                if not named:
+                    raise ValueError("Every section needs a \"section\" name")
+
+
+def iter_exam_flowables(json_file, styles):
+    """Flowables of the answer key, produced one section/question at a time."""
+    header = {}
+    header_done = False
+    summary = None
+    for kind, value in iter_exam_events(json_file):
+        if kind in ("title", "subtitle"):
+            header[kind] = value
+        elif kind == "summary":
+            summary = value
+        elif kind in ("section", "question"):
+            if not header_done:
+                if len(header) < 2:
+                    raise ValueError("Streaming needs \"title\" and \"subtitle\" before \"sections\"")
+                yield from header_elements(header, styles)
+                header_done = True
+            if kind == "section":
+                yield from section_elements(value, styles)
+            else:
+                yield from question_elements(value, styles)
+    if not header_done:
+        yield from header_elements(header, styles)
+    if summary is not None:
+        yield from summary_elements(summary, styles)
+
+
+class FlowableStream(list):
+    """
+    Flowable list for doc.build that refills itself from an iterator, so only
+    a chunk of flowables exists at a time. The layout engine consumes it from
+    the front as usual, so pages (and page numbers) continue across chunks.
+    """
+    
+    def __init__(self, flowables, chunk_size=500):
+        super().__init__()
+        self.source = iter(flowables)
+        self.chunk_size = chunk_size
+        self._refill()
+    
+    def _refill(self):
+        for flowable in self.source:
+            self.append(flowable)
+            if list.__len__(self) >= self.chunk_size:
+                break
+    
+    def __len__(self):
+        # Keep some flowables ahead for keepWithNext look-ahead
+        if list.__len__(self) < self.chunk_size // 2:
+            self._refill()
+        return list.__len__(self)
+
+
+def create_exam_answer_key_streaming(json_file, output_pdf, chunk_size=500, fast=False):
+    """
+    Like create_exam_answer_key, for very large question banks: the JSON is
+    read incrementally and flowables are built and laid out chunk by chunk
+    into a single document, so memory no longer grows with the number of
+    questions' Paragraph objects. fast=True draws each question straight
+    onto the canvas as it is read instead.
+    
+    "title" and "subtitle" must come before "sections" in the file (a
+    ValueError is raised otherwise); keys inside a section may be in any order.
+    """
+    styles = build_styles()
+    if fast:
+        CanvasAnswerKeyRenderer(output_pdf, styles).render_events(iter_exam_events(json_file))
+        print(f"PDF created successfully: {output_pdf}")
+        return
+    doc = SimpleDocTemplate(
+        output_pdf,
+        pagesize=letter,
+        rightMargin=50,
+        leftMargin=50,
+        topMargin=50,
+        bottomMargin=50
+    )
+    doc.build(FlowableStream(iter_exam_flowables(json_file, styles), chunk_size))
+    print(f"PDF created successfully: {output_pdf}")
+
+
+_worker_styles = None
+
+
+def _init_batch_worker():
+    global _worker_styles
+    # Built once per worker process and shared by every document it renders
+    _worker_styles = build_styles()
+
+
+def _render_batch_job(data, output_pdf, fast=False):
+    try:
+        render_answer_key(data, output_pdf, _worker_styles, fast)
+        return output_pdf, None
+    except Exception as e:
+        return output_pdf, str(e)
+
+
+def iter_jsonl_exams(jsonl_file):
+    """
+    Yield (line number, exam data, error) from a JSONL file, one exam per
+    line. Lines that are not valid JSON or not a JSON object come with
+    data None and the reason in error.
+    """
+    with open(jsonl_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(data, dict):
+                yield line_number, None, f"expected a JSON object, got {type(data).__name__}"
+                continue
+            yield line_number, data, None
+
+
+def batch_output_name(data, line_number):
+    """Output file name from the exam's "output" or "id" field, else its line number."""
+    name = data.get("output") or (f"{data['id']}.pdf" if "id" in data else f"exam_{line_number:06d}.pdf")
+    name = os.path.basename(str(name))
+    return name if name.lower().endswith(".pdf") else name + ".pdf"
+
+
+def create_answer_keys_from_jsonl(jsonl_file, output_dir, processes=None, fast=False):
+    """
+    Render one answer key per line of a JSONL file into output_dir using a
+    process pool. Exams are read as they are submitted, with a bounded number
+    in flight, so the JSONL file is never loaded whole. Lines that are not
+    exam objects count as failed; a repeated output name gets the line number
+    appended. fast selects the canvas renderer. Returns (rendered, failed).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    processes = processes or os.cpu_count() or 1
+    max_in_flight = processes * 4
+    rendered = failed = 0
+    start = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_batch_worker) as pool:
+        pending = set()
+        
+        def collect(wait_for):
+            nonlocal rendered, failed
+            done, still_pending = wait(pending, return_when=wait_for)
+            for future in done:
+                output_pdf, error = future.result()
+                if error:
+                    failed += 1
+                    print(f"❌ {output_pdf}: {error}")
+                else:
+                    rendered += 1
+            return still_pending
+        
+        used_names = set()
+        for line_number, data, error in iter_jsonl_exams(jsonl_file):
+            if error:
+                failed += 1
+                print(f"❌ {jsonl_file}:{line_number}: {error}")
+                continue
+            name = batch_output_name(data, line_number)
+            if name.lower() in used_names:
+                # Never let a later line overwrite an earlier exam
+                stem, suffix = name[:-4], f"_line{line_number}"
+                while f"{stem}{suffix}.pdf".lower() in used_names:
+                    suffix += "_"
+                name = f"{stem}{suffix}.pdf"
+                print(f"⚠️ {jsonl_file}:{line_number}: output name already used, writing {name}")
+            used_names.add(name.lower())
+            output_pdf = os.path.join(output_dir, name)
+            pending.add(pool.submit(_render_batch_job, data, output_pdf, fast))
+            if len(pending) >= max_in_flight:
+                pending = collect(FIRST_COMPLETED)
+        collect(ALL_COMPLETED)
+    
+    elapsed = time.perf_counter() - start
+    rate = rendered / elapsed if elapsed else 0
+    print(f"Rendered {rendered} answer keys ({failed} failed) in {elapsed:.2f}s: {rate:.1f} docs/s")
+    return rendered, failed
+
+
+# Synthetic corpora for benchmarking the PDF tools. Every file is derived
+# from (seed, file index), so a corpus can be regenerated byte for byte.
+CORPUS_PRESETS = {
+    "small":  {"files": 5,    "min_pages": 1,  "max_pages": 10,   "images": 1},
+    "medium": {"files": 50,   "min_pages": 5,  "max_pages": 100,  "images": 2},
+    "large":  {"files": 500,  "min_pages": 10, "max_pages": 300,  "images": 3},
+    "huge":   {"files": 5000, "min_pages": 10, "max_pages": 1000, "images": 4},
+}
+
+CORPUS_WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+                "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud").split()
+
+CORPUS_FONT = "Vera"  # TrueType font shipped with reportlab, embedded (subset) in every file
+
+
+def make_corpus_pdf(path, pages, seed, images=1, image_px=256):
+    """
+    Write one synthetic PDF: pages of text in an embedded TrueType font,
+    images drawn from a small per-file pool (stored once, shared by pages)
+    and a chapter outline. Output depends only on the arguments.
+    """
+    rng = random.Random(seed)
+    if CORPUS_FONT not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(CORPUS_FONT, "Vera.ttf"))
+    
+    # Noise images: incompressible, like photos/scans
+    pool = [
+        ImageReader(Image.frombytes("RGB", (image_px, image_px), rng.randbytes(image_px * image_px * 3)))
+        for _ in range(images)
+    ]
+    
+    canv = pdf_canvas.Canvas(path, pagesize=letter, invariant=1)
+    page_width, page_height = letter
+    chapter = 0
+    for number in range(1, pages + 1):
+        if number == 1 or rng.random() < 0.05:
+            chapter += 1
+            key = f"ch{chapter}"
+            canv.bookmarkPage(key)
+            canv.addOutlineEntry(f"Chapter {chapter}", key, level=0)
+            canv.setFont(CORPUS_FONT, 18)
+            canv.drawString(72, page_height - 72, f"Chapter {chapter}")
+        
+        canv.setFont(CORPUS_FONT, 10)
+        y = page_height - 100
+        for _ in range(rng.randint(20, 45)):
+            canv.drawString(72, y, " ".join(rng.choice(CORPUS_WORDS) for _ in range(12)))
+            y -= 13
+        if pool and rng.random() < 0.5:
+            canv.drawImage(rng.choice(pool), page_width - 72 - 144, 72, 144, 144)
+        canv.drawCentredString(page_width / 2, 36, str(number))
+        canv.showPage()
+    canv.save()
+
+
+def generate_corpus(output_dir, preset="small", seed=0, **overrides):
+    """
+    Generate a reproducible corpus into output_dir and write corpus.json
+    describing it. overrides replace preset values (files, min_pages,
+    max_pages, images). Returns the manifest.
+    """
+    if preset not in CORPUS_PRESETS:
+        raise ValueError(f"Unknown preset '{preset}'. Choose from: {', '.join(CORPUS_PRESETS)}")
+    params = dict(CORPUS_PRESETS[preset])
+    params.update({key: value for key, value in overrides.items() if value is not None})
+    os.makedirs(output_dir, exist_ok=True)
+    
+    start = time.perf_counter()
+    documents = []
+    for index in range(params["files"]):
+        file_seed = f"{seed}:{index}"
+        pages = random.Random(file_seed).randint(params["min_pages"], params["max_pages"])
+        name = f"doc_{index:05d}.pdf"
+        make_corpus_pdf(os.path.join(output_dir, name), pages, file_seed, params["images"])
+        documents.append({"name": name, "pages": pages, "bytes": os.path.getsize(os.path.join(output_dir, name))})
+    
+    manifest = {"preset": preset, "seed": seed, **params, "documents": documents}
+    with open(os.path.join(output_dir, "corpus.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    total_pages = sum(entry["pages"] for entry in documents)
+    total_bytes = sum(entry["bytes"] for entry in documents)
+    print(f"Generated {len(documents)} PDFs, {total_pages} pages, {total_bytes / 2**20:.1f} MiB "
+          f"in {time.perf_counter() - start:.2f}s: {output_dir}")
+    return manifest
+
+
 # Example JSON structure
 example_json = {
     "title": "Linux System Administration I Exam",
@@ -215,9 +878,33 @@ example_json = {
 
 
 if __name__ == "__main__":
-    # Save example JSON
-    with open("exam_data.json", "w", encoding='utf-8') as f:
-        json.dump(example_json, f, indent=2, ensure_ascii=False)
+    parser = argparse.ArgumentParser(description="Generate exam answer key PDFs.")
+    parser.add_argument('--batch', metavar='EXAMS_JSONL', help='Render one answer key per line of a JSONL file')
+    parser.add_argument('--output-dir', default='answer_keys', help='Output folder for --batch (default: answer_keys)')
+    parser.add_argument('--processes', type=int, default=None, help='Worker processes for --batch (default: CPU count)')
+    parser.add_argument('--stream', metavar='EXAM_JSON', help='Render one very large exam incrementally')
+    parser.add_argument('--output', default='exam_answer_key.pdf', help='Output PDF for --stream')
+    parser.add_argument('--fast', action='store_true', help='Draw directly on the canvas instead of the platypus layout engine')
+    parser.add_argument('--corpus', metavar='DIR', help='Generate a synthetic PDF corpus for benchmarks into DIR')
+    parser.add_argument('--preset', choices=CORPUS_PRESETS, default='small', help='Corpus size (default: small)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    parser.add_argument('--files', type=int, help='Override the number of corpus files')
+    parser.add_argument('--min-pages', type=int, help='Override the minimum pages per corpus file')
+    parser.add_argument('--max-pages', type=int, help='Override the maximum pages per corpus file')
+    parser.add_argument('--images', type=int, help='Override the distinct images per corpus file')
+    args = parser.parse_args()
     
-    # Generate PDF
-    create_exam_answer_key("exam_data.json", "exam_answer_key.pdf")
\ No newline at end of file
+    if args.corpus:
+        generate_corpus(args.corpus, args.preset, args.seed, files=args.files, min_pages=args.min_pages,
+                        max_pages=args.max_pages, images=args.images)
+    elif args.batch:
+        create_answer_keys_from_jsonl(args.batch, args.output_dir, args.processes, args.fast)
+    elif args.stream:
+        create_exam_answer_key_streaming(args.stream, args.output, fast=args.fast)
+    else:
+        # Save example JSON
+        with open("exam_data.json", "w", encoding='utf-8') as f:
+            json.dump(example_json, f, indent=2, ensure_ascii=False)
+        
+        # Generate PDF
+        create_exam_answer_key("exam_data.json", "exam_answer_key.pdf", fast=args.fast)
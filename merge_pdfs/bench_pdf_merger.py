@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark for pdf_merger.merge_pdfs.
+
+Merges 10 to 10,000 generated input PDFs and reports wall time, time per
+input and peak traced memory, so linear scaling and flat memory can be
+checked. --legacy also runs the old single in-memory PdfWriter merge for
+comparison. --append compares adding a few new files to an existing
+archive by full re-merge against an incremental-update append.
+
+Usage:
+    python bench_pdf_merger.py --counts 10 100 1000 10000 --pages 3
+    python bench_pdf_merger.py --append --counts 100 1000 --new-files 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import PyPDF2
+
+from pdf_merger import merge_pdfs
+
+
+def make_input_pdf(path, pages, text_bytes=2000):
+    """Write a small PDF whose pages each carry a text content stream."""
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(612, 792)
+    filler = ("BT /F1 12 Tf 72 720 Td (" + "x" * 80 + ") Tj ET\n") * max(1, text_bytes // 100)
+    for page in writer.pages:
+        content = PyPDF2.generic.DecodedStreamObject()
+        content.set_data(filler.encode())
+        page[PyPDF2.generic.NameObject("/Contents")] = writer._add_object(content)
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+
+def legacy_merge(pdf_files, output_path):
+    """The previous merge: every page kept in one PdfWriter until the end."""
+    writer = PyPDF2.PdfWriter()
+    readers = []
+    for pdf_file in pdf_files:
+        reader = PyPDF2.PdfReader(pdf_file)
+        readers.append(reader)
+        for page in reader.pages:
+            writer.add_page(page)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_append(work_dir, template, counts, new_files):
+    """Time re-merging archive + new files against appending the new files only."""
+    results = []
+    print(f"{'archive':>7} {'new':>4} {'mode':>9} {'seconds':>9} {'peak MiB':>9}")
+    new_inputs = []
+    for i in range(new_files):
+        path = os.path.join(work_dir, f"new_{i:03d}.pdf")
+        shutil.copyfile(template, path)
+        new_inputs.append(path)
+
+    for count in counts:
+        inputs = []
+        for i in range(count):
+            path = os.path.join(work_dir, f"in_{i:05d}.pdf")
+            if not os.path.exists(path):
+                shutil.copyfile(template, path)
+            inputs.append(path)
+
+        out_dir = os.path.join(work_dir, "out")
+        with contextlib.redirect_stdout(io.StringIO()):
+            merge_pdfs(inputs, "archive.pdf", out_dir)
+        archive = os.path.join(out_dir, "archive.pdf")
+
+        modes = [
+            ("rewrite", lambda: merge_pdfs(inputs + new_inputs, "rewrite.pdf", out_dir)),
+            ("append", lambda: merge_pdfs(new_inputs, "archive.pdf", out_dir, append=True)),
+        ]
+        for mode, func in modes:
+            elapsed, peak = measure(func)
+            results.append({"archive_inputs": count, "new_inputs": new_files, "mode": mode,
+                            "seconds": elapsed, "peak_bytes": peak,
+                            "archive_bytes": os.path.getsize(archive)})
+            print(f"{count:>7} {new_files:>4} {mode:>9} {elapsed:>9.3f} {peak / 2**20:>9.1f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark merge_pdfs over growing numbers of inputs.")
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 1000], help='Input file counts')
+    parser.add_argument('--pages', type=int, default=3, help='Pages per input (default: 3)')
+    parser.add_argument('--legacy', action='store_true', help='Also time the old in-memory merge')
+    parser.add_argument('--append', action='store_true', help='Benchmark incremental append instead')
+    parser.add_argument('--new-files', type=int, default=5, help='Files appended per run with --append')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="pdf_merger_bench_")
+    template = os.path.join(work_dir, "template.pdf")
+    make_input_pdf(template, args.pages)
+    results = []
+    try:
+        if args.append:
+            results = bench_append(work_dir, template, args.counts, args.new_files)
+            return
+        print(f"{'inputs':>7} {'mode':>9} {'seconds':>9} {'ms/input':>9} {'peak MiB':>9}")
+        for count in args.counts:
+            inputs = []
+            for i in range(count):
+                path = os.path.join(work_dir, f"in_{i:05d}.pdf")
+                if not os.path.exists(path):
+                    shutil.copyfile(template, path)
+                inputs.append(path)
+
+            modes = [("streaming", lambda: merge_pdfs(inputs, "merged.pdf", work_dir))]
+            if args.legacy:
+                modes.append(("legacy", lambda: legacy_merge(inputs, os.path.join(work_dir, "legacy.pdf"))))
+            for mode, func in modes:
+                elapsed, peak = measure(func)
+                results.append({"inputs": count, "mode": mode, "seconds": elapsed, "peak_bytes": peak})
+                print(f"{count:>7} {mode:>9} {elapsed:>9.2f} {elapsed / count * 1000:>9.2f} {peak / 2**20:>9.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        write_results(args, results)
+
+
+def write_results(args, results):
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"pages_per_input": args.pages, "results": results}, f, indent=2)
+        print(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
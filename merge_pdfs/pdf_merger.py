@@ -2,15 +2,389 @@
 """
 PDF Merger Script
 Merges multiple PDF files into a single PDF file.
+
+Batch mode runs many merge jobs from a YAML or JSON manifest:
+    python pdf_merger.py --batch jobs.yaml --jobs 4
+
+    output_dir: merged
+    recursive: true
+    jobs:
+      - output: chapter1.pdf
+        inputs: [scans/chapter1]
+      - output: appendix.pdf
+        inputs: ["extra/*.pdf", cover.pdf]
 """
 
 import PyPDF2
+from PyPDF2.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject, NullObject, NumberObject, StreamObject,
+)
+import contextlib
+import hashlib
+import io
+import json
 import os
+import re
 import sys
 import glob
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
 from pathlib import Path
 
-def merge_pdfs(pdf_files, output_filename="merged_document.pdf", output_dir=None):
+class StreamingPdfMerger:
+    """
+    Write a merged PDF progressively.
+
+    Each input is copied into its own short-lived PdfWriter, its objects are
+    renumbered and written straight to the output, and everything is
+    released before the next input is opened. Only the byte offset of every
+    object and the list of page references are kept until the end, so peak
+    memory follows the largest single input rather than the whole batch.
+
+    With dedup on, stream objects (fonts, images, ICC profiles, ...) are
+    hashed after renumbering and a stream identical to one already written
+    by any input reuses that object instead of being written again.
+    """
+
+    PAGES_ID = 1
+    CATALOG_ID = 2
+    INFO_ID = 3
+
+    def __init__(self, output_path, dedup=True):
+        self.stream = open(output_path, 'wb')
+        self.stream.write(b"%PDF-1.7\n%\xE2\xE3\xCF\xD3\n")
+        self.offsets = {}  # object number -> byte offset
+        self.next_id = 4
+        self.pages_id = self.PAGES_ID
+        self.page_ids = []
+        self._init_dedup(dedup)
+
+    def _init_dedup(self, dedup):
+        # sha256 of a written stream object -> its object number, across all inputs
+        self.dedup = dedup
+        self.stream_ids = {}
+        self.dedup_streams = 0
+        self.dedup_bytes = 0
+
+    def add_reader(self, pdf_reader):
+        """Copy every page of an open PdfReader to the output. Returns the number of pages added."""
+        chunk = PyPDF2.PdfWriter()
+        for page in pdf_reader.pages:
+            chunk.add_page(page)
+        # Pull in every object the pages use while the input file is still open
+        chunk._sweep_indirect_references(chunk._root)
+        return self._write_chunk(chunk)
+
+    def _write_chunk(self, chunk):
+        own_ids = {chunk._pages.idnum, chunk._info.idnum, chunk._root.idnum}
+        mapping = {chunk._pages.idnum: self.pages_id}
+        streams = {}
+        for idnum, obj in enumerate(chunk._objects, 1):
+            if obj is None or idnum in own_ids:
+                continue
+            if self.dedup and isinstance(obj, StreamObject):
+                streams[idnum] = obj
+            else:
+                mapping[idnum] = self._new_id()
+
+        # Streams are numbered last so identical ones can share an object number
+        state = {}
+        for idnum in streams:
+            self._write_stream(idnum, streams, mapping, state)
+
+        for idnum, obj in enumerate(chunk._objects, 1):
+            if obj is None or idnum in own_ids or idnum in streams:
+                continue
+            obj = self._renumber(obj, mapping)
+            self._write_object(mapping[idnum], obj)
+
+        # Only reference the pages once all of their objects are on disk
+        kids = chunk.get_object(chunk._pages)["/Kids"]
+        for kid in kids:
+            self.page_ids.append(mapping[kid.idnum])
+        return len(kids)
+
+    def _write_stream(self, idnum, streams, mapping, state):
+        """
+        Write one stream after the streams it references (depth first), or
+        map it to an identical stream already written by any input.
+        """
+        if idnum in mapping:
+            return
+        if state.get(idnum) == "visiting":
+            # Reference cycle between streams: number it now, without dedup
+            mapping[idnum] = self._new_id()
+            return
+        state[idnum] = "visiting"
+        obj = streams[idnum]
+        for value in self._references(obj):
+            if value.idnum in streams:
+                self._write_stream(value.idnum, streams, mapping, state)
+        if idnum in mapping:
+            # Numbered while resolving a cycle; write it without dedup
+            self._write_object(mapping[idnum], self._renumber(obj, mapping))
+            return
+
+        buffer = BytesIO()
+        self._renumber(obj, mapping).write_to_stream(buffer, None)
+        body = buffer.getvalue()
+        digest = hashlib.sha256(body).digest()
+        existing = self.stream_ids.get(digest)
+        if existing is not None:
+            mapping[idnum] = existing
+            self.dedup_streams += 1
+            self.dedup_bytes += len(body)
+            return
+        mapping[idnum] = self._new_id()
+        self.stream_ids[digest] = mapping[idnum]
+        self._write_raw_object(mapping[idnum], body)
+
+    @staticmethod
+    def _references(obj):
+        """Yield the indirect references directly inside obj (not following them)."""
+        stack = [obj]
+        while stack:
+            container = stack.pop()
+            values = container.values() if isinstance(container, DictionaryObject) else container
+            for value in values:
+                if isinstance(value, IndirectObject):
+                    yield value
+                elif isinstance(value, (DictionaryObject, ArrayObject)):
+                    stack.append(value)
+
+    def _new_id(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    @staticmethod
+    def _renumber(obj, mapping):
+        """Point every indirect reference inside obj at its new object number."""
+        def remap(value):
+            if isinstance(value, IndirectObject):
+                new_id = mapping.get(value.idnum)
+                return IndirectObject(new_id, 0, None) if new_id else NullObject()
+            return value
+
+        if isinstance(obj, IndirectObject):
+            return remap(obj)
+        stack = [obj]
+        while stack:
+            container = stack.pop()
+            if isinstance(container, DictionaryObject):
+                for key, value in list(container.items()):
+                    if isinstance(value, IndirectObject):
+                        container[key] = remap(value)
+                    elif isinstance(value, (DictionaryObject, ArrayObject)):
+                        stack.append(value)
+            elif isinstance(container, ArrayObject):
+                for i, value in enumerate(container):
+                    if isinstance(value, IndirectObject):
+                        container[i] = remap(value)
+                    elif isinstance(value, (DictionaryObject, ArrayObject)):
+                        stack.append(value)
+        return obj
+
+    def _write_object(self, object_id, obj):
+        self.offsets[object_id] = self.stream.tell()
+        self.stream.write(f"{object_id} 0 obj\n".encode())
+        obj.write_to_stream(self.stream, None)
+        self.stream.write(b"\nendobj\n")
+
+    def _write_raw_object(self, object_id, body):
+        self.offsets[object_id] = self.stream.tell()
+        self.stream.write(f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def close(self):
+        """Write the page tree, catalog, xref table and trailer, then close the output."""
+        kids = b" ".join(f"{page_id} 0 R".encode() for page_id in self.page_ids)
+        self._write_raw_object(
+            self.PAGES_ID,
+            b"<< /Type /Pages /Count " + str(len(self.page_ids)).encode() + b" /Kids [ " + kids + b" ] >>",
+        )
+        self._write_raw_object(self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode())
+        self._write_raw_object(self.INFO_ID, b"<< /Producer (pdf_merger.py) >>")
+
+        xref_location = self.stream.tell()
+        self.stream.write(f"xref\n0 {self.next_id}\n".encode())
+        self.stream.write(b"0000000000 65535 f \n")
+        for object_id in range(1, self.next_id):
+            offset = self.offsets.get(object_id)
+            if offset is None:
+                # Object numbers reserved by an input that failed half way
+                self.stream.write(b"0000000000 00001 f \n")
+            else:
+                self.stream.write(f"{offset:010d} 00000 n \n".encode())
+        self.stream.write(
+            f"trailer\n<< /Size {self.next_id} /Root {self.CATALOG_ID} 0 R "
+            f"/Info {self.INFO_ID} 0 R >>\nstartxref\n{xref_location}\n%%EOF\n".encode()
+        )
+        self.stream.close()
+
+    def abort(self):
+        """Close and delete a partially written output."""
+        self.stream.close()
+        os.remove(self.stream.name)
+
+    @property
+    def page_count(self):
+        return len(self.page_ids)
+
+class IncrementalPdfAppender(StreamingPdfMerger):
+    """
+    Append pages to an existing PDF as an incremental update.
+
+    The existing bytes are left untouched: new objects, a new intermediate
+    page tree node, a new version of the root /Pages object and a new xref
+    section with /Prev pointing at the previous one are written after the
+    current %%EOF. The cost follows the size of the new content, not the
+    size of the existing document.
+    """
+
+    def __init__(self, existing_path, dedup=True):
+        with open(existing_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            if pdf_reader.is_encrypted:
+                raise ValueError("Cannot append to an encrypted PDF")
+            trailer = pdf_reader.trailer
+            self.root_ref = trailer.raw_get("/Root")
+            self.info_ref = trailer.raw_get("/Info") if "/Info" in trailer else None
+            self.file_id = trailer.get("/ID")
+            pages_ref = self.root_ref.get_object().raw_get("/Pages")
+            old_pages = pages_ref.get_object()
+            # New version of the root /Pages object: same keys, one more kid
+            self.root_pages = DictionaryObject(old_pages)
+            self.root_pages[NameObject("/Kids")] = ArrayObject(old_pages["/Kids"].get_object())
+            self.old_page_count = int(old_pages["/Count"])
+            self.root_pages_ref = pages_ref
+            self.prev_xref = self._find_startxref(file)
+            # PyPDF2 leaves /Size out of the trailer of files with a cross-reference stream
+            size = max(int(trailer.get("/Size", 0)), self._next_object_number(pdf_reader, file, self.prev_xref))
+
+        self.stream = open(existing_path, 'r+b')
+        self.original_size = self.stream.seek(0, os.SEEK_END)
+        self.stream.seek(-1, os.SEEK_END)
+        if self.stream.read(1) not in (b"\n", b"\r"):
+            self.stream.write(b"\n")
+        self.offsets = {}
+        self.next_id = size
+        self.page_ids = []
+        self.pages_id = self._new_id()  # intermediate node holding the appended pages
+        self._init_dedup(dedup)
+
+    def abort(self):
+        """Drop everything written so far, leaving the existing PDF as it was."""
+        self.stream.truncate(self.original_size)
+        self.stream.close()
+
+    @staticmethod
+    def _find_startxref(file):
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(max(0, size - 2048))
+        tail = file.read()
+        position = tail.rfind(b"startxref")
+        if position == -1:
+            raise ValueError("startxref not found in existing PDF")
+        return int(tail[position + len(b"startxref"):].split()[0])
+
+    @staticmethod
+    def _next_object_number(pdf_reader, file, xref_location):
+        """First object number not used by the existing PDF, from its xref tables and object streams."""
+        used = [idnum for table in pdf_reader.xref.values() for idnum in table]
+        used.extend(pdf_reader.xref_objStm)
+        # A cross-reference stream is an object itself and need not list its own number
+        file.seek(xref_location)
+        header = file.read(32).split()
+        if len(header) >= 3 and header[0].isdigit() and header[2] == b"obj":
+            used.append(int(header[0]))
+        return max(used, default=0) + 1
+
+    def close(self):
+        """Write the new page tree nodes, xref section and trailer after the existing data."""
+        root_pages_id = self.root_pages_ref.idnum
+        generation = self.root_pages_ref.generation
+        kids = b" ".join(f"{page_id} 0 R".encode() for page_id in self.page_ids)
+        self._write_raw_object(
+            self.pages_id,
+            f"<< /Type /Pages /Parent {root_pages_id} {generation} R /Count {len(self.page_ids)} /Kids [ ".encode()
+            + kids + b" ] >>",
+        )
+        self.root_pages["/Kids"].append(IndirectObject(self.pages_id, 0, None))
+        self.root_pages[NameObject("/Count")] = NumberObject(self.old_page_count + len(self.page_ids))
+        self.offsets[root_pages_id] = self.stream.tell()
+        self.stream.write(f"{root_pages_id} {generation} obj\n".encode())
+        self.root_pages.write_to_stream(self.stream, None)
+        self.stream.write(b"\nendobj\n")
+
+        # One xref subsection per run of consecutive object numbers
+        xref_location = self.stream.tell()
+        self.stream.write(b"xref\n")
+        object_ids = sorted(self.offsets)
+        start = 0
+        while start < len(object_ids):
+            end = start
+            while end + 1 < len(object_ids) and object_ids[end + 1] == object_ids[end] + 1:
+                end += 1
+            self.stream.write(f"{object_ids[start]} {end - start + 1}\n".encode())
+            for object_id in object_ids[start:end + 1]:
+                gen = generation if object_id == root_pages_id else 0
+                self.stream.write(f"{self.offsets[object_id]:010d} {gen:05d} n \n".encode())
+            start = end + 1
+
+        trailer = (f"<< /Size {self.next_id} /Root {self.root_ref.idnum} {self.root_ref.generation} R "
+                   f"/Prev {self.prev_xref}")
+        if self.info_ref is not None:
+            trailer += f" /Info {self.info_ref.idnum} {self.info_ref.generation} R"
+        self.stream.write(f"trailer\n{trailer}".encode())
+        if self.file_id is not None:
+            self.stream.write(b" /ID ")
+            self.file_id.write_to_stream(self.stream, None)
+        self.stream.write(f" >>\nstartxref\n{xref_location}\n%%EOF\n".encode())
+        self.stream.truncate()
+        self.stream.close()
+
+# Rough costs used for the up-front estimate (from bench_pdf_merger.py runs)
+ESTIMATED_SECONDS_PER_PAGE = 0.0025
+ESTIMATED_MEMORY_PER_INPUT_BYTE = 4
+
+def scan_pdf(pdf_file):
+    """
+    Open one input and describe it without merging anything.
+    Returns a dict with path, size, pages, encrypted and error (None if usable).
+    """
+    info = {"path": pdf_file, "size": 0, "pages": 0, "encrypted": False, "error": None}
+    if not os.path.exists(pdf_file) or not pdf_file.lower().endswith('.pdf'):
+        info["error"] = "File not found or not a PDF"
+        return info
+    try:
+        info["size"] = os.path.getsize(pdf_file)
+        with open(pdf_file, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            if pdf_reader.is_encrypted:
+                info["encrypted"] = True
+                # Files with an empty user password can still be merged
+                if not pdf_reader.decrypt(""):
+                    info["error"] = "Encrypted (password required)"
+                    return info
+            info["pages"] = len(pdf_reader.pages)
+    except Exception as e:
+        info["error"] = f"{type(e).__name__}: {e}"
+    return info
+
+# Below this many inputs starting a pool (~10ms) costs more than scanning serially
+MIN_FILES_FOR_PRESCAN_POOL = 32
+
+def prescan_pdfs(pdf_files, workers=None):
+    """Scan every input, in a process pool for larger batches, keeping the input order."""
+    workers = workers or os.cpu_count() or 1
+    if len(pdf_files) < MIN_FILES_FOR_PRESCAN_POOL or workers == 1:
+        return [scan_pdf(pdf_file) for pdf_file in pdf_files]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(scan_pdf, pdf_files, chunksize=max(1, len(pdf_files) // 64)))
+
+def merge_pdfs(pdf_files, output_filename="merged_document.pdf", output_dir=None, dedup=True, workers=None,
+               append=False):
     """
     Merge multiple PDF files into a single PDF.
     
@@ -18,26 +392,56 @@ def merge_pdfs(pdf_files, output_filename="merged_document.pdf", output_dir=None
         pdf_files (list): List of PDF file paths to merge
         output_filename (str): Name of the output merged PDF file
         output_dir (str): Directory to save the merged PDF (default: same as first input file)
+        dedup (bool): Store identical fonts, images and other streams only once
+        workers (int): Processes used to prescan the inputs (default: CPU count; batches
+            under MIN_FILES_FOR_PRESCAN_POOL files are scanned serially)
+        append (bool): If the output already exists, add the new pages to it as an
+            incremental update instead of rewriting it
     
     Returns:
         str: Path to the merged PDF file if successful, None otherwise
     """
+    return _merge_pdfs(pdf_files, output_filename, output_dir, dedup, workers, append)[0]
+
+def _merge_pdfs(pdf_files, output_filename, output_dir, dedup, workers, append):
+    """
+    merge_pdfs, returning (output path or None, total pages in the output,
+    inputs whose pages were merged, [(input, error)] for inputs left out).
+    """
     if not pdf_files:
         print("❌ Error: No PDF files provided.")
-        return None
+        return None, 0, [], []
     
-    # Validate all input files exist
+    # Open every input up front so bad files are rejected before any output is written
+    print(f"🔍 Scanning {len(pdf_files)} files...")
+    scans = prescan_pdfs(pdf_files, workers)
     valid_files = []
-    for pdf_file in pdf_files:
-        if os.path.exists(pdf_file) and pdf_file.lower().endswith('.pdf'):
-            valid_files.append(pdf_file)
-            print(f"✅ Found: {pdf_file}")
+    rejected = []  # prescan results with an error
+    for info in scans:
+        if info["error"] is None:
+            valid_files.append(info["path"])
+            lock = " 🔓 (encrypted, no password)" if info["encrypted"] else ""
+            print(f"✅ Found: {info['path']} ({info['pages']} pages){lock}")
         else:
-            print(f"⚠️  Warning: File not found or not a PDF: {pdf_file}")
+            rejected.append(info)
+    
+    if rejected:
+        print(f"\n⚠️  Rejected {len(rejected)} files:")
+        for info in rejected:
+            print(f"   ❌ {info['path']}: {info['error']}")
     
+    skipped = [(info["path"], info["error"]) for info in rejected]
     if not valid_files:
         print("❌ Error: No valid PDF files found.")
-        return None
+        return None, 0, [], skipped
+    
+    usable = [info for info in scans if info["error"] is None]
+    expected_pages = sum(info["pages"] for info in usable)
+    largest = max(info["size"] for info in usable)
+    print(f"\n📋 Expected pages: {expected_pages}")
+    print(f"   Estimated time: ~{expected_pages * ESTIMATED_SECONDS_PER_PAGE:.1f}s, "
+          f"peak memory: ~{largest * ESTIMATED_MEMORY_PER_INPUT_BYTE / 2**20:.1f} MiB "
+          f"(largest input {largest / 2**20:.1f} MiB)")
     
     # Determine output directory
     if output_dir is None:
@@ -49,9 +453,23 @@ def merge_pdfs(pdf_files, output_filename="merged_document.pdf", output_dir=None
     # Create full output path
     output_path = os.path.join(output_dir, output_filename)
     
+    # Never read the document we are writing to (e.g. when merging a whole directory)
+    if os.path.abspath(output_path) in {os.path.abspath(f) for f in valid_files}:
+        print(f"⚠️  Skipping the output file itself: {output_path}")
+        valid_files = [f for f in valid_files if os.path.abspath(f) != os.path.abspath(output_path)]
+        if not valid_files:
+            print("❌ Error: No valid PDF files found.")
+            return None, 0, [], skipped
+    
+    merger = None
+    merged_files = []
     try:
-        # Create PDF writer object
-        pdf_writer = PyPDF2.PdfWriter()
+        # Pages are written to the output as each input is processed
+        if append and os.path.exists(output_path):
+            merger = IncrementalPdfAppender(output_path, dedup=dedup)
+            print(f"\n➕ Appending to existing {output_path} ({merger.old_page_count} pages)")
+        else:
+            merger = StreamingPdfMerger(output_path, dedup=dedup)
         
         print(f"\n📄 Merging {len(valid_files)} PDF files...")
         
@@ -62,38 +480,198 @@ def merge_pdfs(pdf_files, output_filename="merged_document.pdf", output_dir=None
                 
                 with open(pdf_file, 'rb') as file:
                     pdf_reader = PyPDF2.PdfReader(file)
+                    if pdf_reader.is_encrypted:
+                        pdf_reader.decrypt("")
                     
-                    # Add all pages from current PDF
-                    for page_num in range(len(pdf_reader.pages)):
-                        page = pdf_reader.pages[page_num]
-                        pdf_writer.add_page(page)
+                    # Add all pages from current PDF while the file is still open
+                    added = merger.add_reader(pdf_reader)
                     
-                    print(f"   ✅ Added {len(pdf_reader.pages)} pages")
+                    print(f"   ✅ Added {added} pages")
+                    merged_files.append(pdf_file)
                     
             except Exception as e:
                 print(f"   ❌ Error processing {pdf_file}: {e}")
+                skipped.append((pdf_file, str(e)))
                 continue
         
-        # Write merged PDF to output file
-        with open(output_path, 'wb') as output_file:
-            pdf_writer.write(output_file)
+        merger.close()
         
-        total_pages = len(pdf_writer.pages)
+        added_pages = merger.page_count
+        total_pages = added_pages
+        if isinstance(merger, IncrementalPdfAppender):
+            total_pages += merger.old_page_count
+            print(f"\n➕ Appended {added_pages} pages ({total_pages} in total)")
         print(f"\n🎉 Success! Merged PDF created:")
         print(f"   📁 Location: {output_path}")
         print(f"   📄 Total pages: {total_pages}")
-        print(f"   📊 Files merged: {len(valid_files)}")
+        if added_pages != expected_pages:
+            print(f"   ⚠️  Expected {expected_pages} pages from the prescan")
+        print(f"   📊 Files merged: {len(merged_files)}")
+        if merger.dedup_streams:
+            print(f"   ♻️  Shared streams: {merger.dedup_streams} duplicates removed, "
+                  f"{merger.dedup_bytes / 1024:.1f} KiB saved")
         
-        return output_path
+        return output_path, total_pages, merged_files, skipped
         
     except Exception as e:
         print(f"❌ Error creating merged PDF: {e}")
-        return None
+        if merger is not None and not merger.stream.closed:
+            merger.abort()
+        return None, 0, [], skipped
 
-def get_pdf_files_from_directory(directory):
-    """Get all PDF files from a directory."""
-    pdf_pattern = os.path.join(directory, "*.pdf")
-    return glob.glob(pdf_pattern)
+def natural_sort_key(path):
+    """Sort key that orders "page2.pdf" before "page10.pdf"."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', path)]
+
+def get_pdf_files_from_directory(directory, recursive=False):
+    """Get all PDF files from a directory (and its subdirectories if recursive), in natural order."""
+    pdf_files = []
+    if recursive:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort(key=natural_sort_key)
+            pdf_files.extend(os.path.join(root, name) for name in files if name.lower().endswith('.pdf'))
+    else:
+        pdf_files = [
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith('.pdf') and os.path.isfile(os.path.join(directory, name))
+        ]
+    return sorted(pdf_files, key=lambda path: natural_sort_key(os.path.relpath(path, directory)))
+
+def expand_job_inputs(inputs, base_dir, recursive=False):
+    """Turn a job's inputs (files, directories or glob patterns) into an ordered list of PDF paths."""
+    pdf_files = []
+    for entry in inputs:
+        path = os.path.join(base_dir, os.path.expanduser(entry))
+        if os.path.isdir(path):
+            pdf_files.extend(get_pdf_files_from_directory(path, recursive))
+        elif glob.has_magic(path):
+            pdf_files.extend(sorted(glob.glob(path, recursive=True), key=natural_sort_key))
+        else:
+            pdf_files.append(path)
+    return pdf_files
+
+def load_merge_jobs(manifest_path):
+    """
+    Read a YAML or JSON manifest of merge jobs: a list of jobs, or a mapping
+    with defaults ("output_dir", "recursive", "dedup", "append") and "jobs".
+    Each job has "inputs" (files, directories or glob patterns) and
+    "output"; relative paths are resolved against the manifest's folder.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        if manifest_path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("PyYAML is required for YAML manifests (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data
+        data = data.get("jobs", [])
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    default_output_dir = os.path.join(base_dir, defaults.get("output_dir", "."))
+    jobs = []
+    for i, entry in enumerate(data or [], 1):
+        inputs = entry.get("inputs", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        recursive = entry.get("recursive", defaults.get("recursive", False))
+        output = entry.get("output", f"merged_{i}.pdf")
+        if not output.lower().endswith('.pdf'):
+            output += '.pdf'
+        output = os.path.join(os.path.join(base_dir, entry.get("output_dir", default_output_dir)), output)
+        jobs.append({
+            "inputs": expand_job_inputs(inputs, base_dir, recursive),
+            "output": output,
+            "dedup": entry.get("dedup", defaults.get("dedup", True)),
+            "append": entry.get("append", defaults.get("append", False)),
+        })
+    return jobs
+
+def _run_merge_job(job):
+    log = io.StringIO()
+    start = time.perf_counter()
+    result = None
+    pages = 0
+    merged = []
+    skipped = []
+    error = None
+    try:
+        with contextlib.redirect_stdout(log):
+            # The jobs already run in parallel, so each one prescans serially
+            result, pages, merged, skipped = _merge_pdfs(job["inputs"], os.path.basename(job["output"]),
+                                        os.path.dirname(job["output"]), job["dedup"], 1, job["append"])
+        if result is None:
+            error = "merge failed"
+    except Exception as e:
+        error = str(e)
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(result) if result else 0
+    return {
+        "output": job["output"],
+        "files": len(merged),
+        "rejected": skipped,
+        "error": error,
+        "seconds": elapsed,
+        "pages": pages,
+        "bytes": size,
+        "log": log.getvalue(),
+    }
+
+def run_merge_batch(manifest_path, processes=None):
+    """Run every merge job in a manifest in a process pool and print a throughput summary."""
+    try:
+        jobs = load_merge_jobs(manifest_path)
+    except Exception as e:
+        print(f"❌ Error reading manifest {manifest_path}: {e}")
+        return []
+    if not jobs:
+        print("❌ Error: No jobs found in manifest.")
+        return []
+
+    outputs = [os.path.abspath(job["output"]) for job in jobs]
+    if len(set(outputs)) != len(outputs):
+        print("❌ Error: Several jobs write the same output file.")
+        return []
+
+    print(f"📦 Running {len(jobs)} merge jobs with {processes or os.cpu_count()} processes")
+    print("-" * 50)
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_run_merge_job, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            name = os.path.basename(result["output"])
+            if result["error"]:
+                print(f"❌ {name}: {result['error']}")
+                print(result["log"])
+            else:
+                print(f"✅ {name}: {result['files']} files, {result['pages']} pages, "
+                      f"{result['bytes'] / 2**20:.1f} MiB in {result['seconds']:.2f}s")
+            for path, reason in result["rejected"]:
+                print(f"   ⚠️  Rejected {path}: {reason}")
+
+    elapsed = time.perf_counter() - start
+    done = [r for r in results if not r["error"]]
+    pages = sum(r["pages"] for r in done)
+    size = sum(r["bytes"] for r in done)
+    print("-" * 50)
+    rejected = sum(len(r["rejected"]) for r in results)
+    print(f"📊 {len(done)}/{len(results)} jobs succeeded, {sum(r['files'] for r in done)} files, "
+          f"{pages} pages, {size / 2**20:.1f} MiB in {elapsed:.2f}s")
+    if rejected:
+        print(f"   ⚠️  {rejected} input files rejected")
+    if elapsed:
+        print(f"   ⚡ {len(done) / elapsed:.1f} jobs/s, {pages / elapsed:.0f} pages/s, "
+              f"{size / 2**20 / elapsed:.1f} MiB/s")
+    return results
 
 def main():
     """Main function to handle user input and merge PDFs."""
@@ -101,11 +679,30 @@ def main():
     print("=" * 30)
     
     # Method 1: Command line arguments
-    if len(sys.argv) > 1:
-        pdf_files = sys.argv[1:]
+    args = sys.argv[1:]
+    if "--batch" in args:
+        # Batch mode: python pdf_merger.py --batch jobs.yaml [--jobs N]
+        try:
+            manifest = args[args.index("--batch") + 1]
+            processes = int(args[args.index("--jobs") + 1]) if "--jobs" in args else None
+        except (IndexError, ValueError):
+            print("❌ Usage: pdf_merger.py --batch MANIFEST [--jobs N]")
+            sys.exit(1)
+        results = run_merge_batch(manifest, processes)
+        if not results or any(r["error"] for r in results):
+            sys.exit(1)
+        return
+    
+    append = "--append" in args
+    if append:
+        args.remove("--append")
+    if args:
+        pdf_files = args
         output_name = "merged_document.pdf"
         
         print(f"📝 Command line mode: {len(pdf_files)} files specified")
+        if append:
+            print("➕ Append mode: new pages are added to an existing merged_document.pdf")
         
     else:
         # Method 2: Interactive mode
@@ -159,7 +756,7 @@ def main():
     
     # Merge PDFs
     if pdf_files:
-        result = merge_pdfs(pdf_files, output_name)
+        result = merge_pdfs(pdf_files, output_name, append=append)
         if result:
             print(f"\n✨ Merge completed successfully!")
         else:
@@ -0,0 +1,106 @@
+"""Appending to existing PDFs (classic xref tables and cross-reference streams) and batch job summaries."""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import fitz  # PyMuPDF
+import PyPDF2
+
+from pdf_merger import _run_merge_job, merge_pdfs
+
+
+def make_pdf(path, label, pages, object_streams=False):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"{label} page {number + 1}")
+    if object_streams:
+        # Object streams force a cross-reference stream instead of an xref table
+        doc.save(path, garbage=3, use_objstms=1)
+    else:
+        doc.save(path)
+    doc.close()
+    return path
+
+
+def page_texts(path):
+    reader = PyPDF2.PdfReader(path)
+    return [page.extract_text().strip() for page in reader.pages]
+
+
+class AppendTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="pdf_merger_test_")
+        self.inputs = [make_pdf(os.path.join(self.folder, "new1.pdf"), "new1", 2),
+                       make_pdf(os.path.join(self.folder, "new2.pdf"), "new2", 1)]
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def append_to(self, existing):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return merge_pdfs(self.inputs, os.path.basename(existing), self.folder, append=True)
+
+    def check_appended(self, object_streams):
+        existing = make_pdf(os.path.join(self.folder, "existing.pdf"), "old", 40, object_streams)
+        with open(existing, 'rb') as f:
+            original = f.read()
+
+        self.assertEqual(self.append_to(existing), existing)
+
+        with open(existing, 'rb') as f:
+            self.assertTrue(f.read().startswith(original))
+        texts = page_texts(existing)
+        self.assertEqual(len(texts), 43)
+        self.assertEqual(texts[0], "old page 1")
+        self.assertEqual(texts[39], "old page 40")
+        self.assertEqual(texts[40:], ["new1 page 1", "new1 page 2", "new2 page 1"])
+        with fitz.open(existing) as doc:
+            self.assertFalse(doc.is_repaired)
+            self.assertEqual(doc[42].get_text().strip(), "new2 page 1")
+
+    def test_append_to_classic_xref_pdf(self):
+        self.check_appended(object_streams=False)
+
+    def test_append_to_xref_stream_pdf(self):
+        self.check_appended(object_streams=True)
+
+    def test_append_twice_to_xref_stream_pdf(self):
+        existing = make_pdf(os.path.join(self.folder, "existing.pdf"), "old", 40, object_streams=True)
+        self.append_to(existing)
+        self.append_to(existing)
+        texts = page_texts(existing)
+        self.assertEqual(len(texts), 46)
+        self.assertEqual(texts[43:], ["new1 page 1", "new1 page 2", "new2 page 1"])
+
+
+class MergeJobSummaryTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="pdf_merger_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_rejected_inputs_are_not_counted_as_merged(self):
+        good = [make_pdf(os.path.join(self.folder, f"good{i}.pdf"), f"good{i}", 2) for i in range(2)]
+        broken = os.path.join(self.folder, "broken.pdf")
+        with open(broken, 'wb') as f:
+            f.write(b"not a pdf")
+        missing = os.path.join(self.folder, "missing.pdf")
+        job = {"inputs": [good[0], broken, good[1], missing], "output": os.path.join(self.folder, "out.pdf"),
+               "dedup": True, "append": False}
+
+        result = _run_merge_job(job)
+
+        self.assertIsNone(result["error"])
+        self.assertEqual(result["files"], 2)
+        self.assertEqual(result["pages"], 4)
+        self.assertEqual([path for path, _ in result["rejected"]], [broken, missing])
+
+
+if __name__ == "__main__":
+    unittest.main()